@@ -0,0 +1,28 @@
+-- V008: SCA completion notifications
+-- Publishes sca_challenges status changes on the 'sca_completed' channel so
+-- waiters are woken by LISTEN/NOTIFY instead of polling the table
+
+-- ============================================================================
+-- STEP 1: Create notification function
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION notify_sca_status_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Payload is the challenge_id; delivered to listeners on COMMIT
+    PERFORM pg_notify('sca_completed', NEW.challenge_id::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION notify_sca_status_change IS 'NOTIFY sca_completed with the challenge_id on SCA status change';
+
+-- ============================================================================
+-- STEP 2: Attach trigger to sca_challenges
+-- ============================================================================
+
+CREATE TRIGGER trigger_sca_status_notify
+AFTER UPDATE OF status ON sca_challenges
+FOR EACH ROW
+WHEN (OLD.status IS DISTINCT FROM NEW.status)
+EXECUTE FUNCTION notify_sca_status_change();
@@ -0,0 +1,69 @@
+"""
+Minimal circuit breaker for upstream service calls.
+Opens after consecutive failures so callers fail fast instead of waiting on timeouts.
+"""
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open).
+
+    Single event loop use only: state is mutated without locking.
+    """
+
+    def __init__(self, name: str, fail_max: int, reset_timeout: float):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half-open."""
+        if self._opened_at is None:
+            return "closed"
+        if self._trial_in_flight or time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be issued.
+
+        Once the cooldown has elapsed a single trial call is let through;
+        concurrent callers keep failing fast until it completes.
+        """
+        if self._opened_at is None:
+            return True
+        if self._trial_in_flight:
+            return False
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self._opened_at is not None:
+            logger.info("Circuit breaker '%s' closed", self.name)
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure and open the circuit past the threshold (or on a failed trial)."""
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.fail_max:
+            if self._opened_at is None:
+                logger.warning(
+                    "Circuit breaker '%s' opened after %d consecutive failures",
+                    self.name, self._failures
+                )
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
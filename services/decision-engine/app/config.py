@@ -1,81 +1,110 @@
-"""
-Configuration settings for Decision Engine service.
-"""
-import os
-from typing import Optional
-from pydantic_settings import BaseSettings
-
-
-class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
-    
-    # Service config
-    SERVICE_NAME: str = "decision-engine"
-    VERSION: str = "1.0.0"
-    HOST: str = "0.0.0.0"
-    PORT: int = 8000
-    
-    # Timeouts and budgets (milliseconds)
-    # Note: Model serving may call IP geolocation API (1-2s latency)
-    ORCHESTRATION_TIMEOUT_MS: int = 100
-    MODEL_SERVING_TIMEOUT_MS: int = 5000  # 5s for IP geolocation
-    RULES_SERVICE_TIMEOUT_MS: int = 1000
-    TOTAL_TIMEOUT_MS: int = 6000
-    
-    # External services
-    MODEL_SERVING_URL: str = os.getenv("MODEL_SERVING_URL", "http://model-serving:8001")
-    RULES_SERVICE_URL: str = os.getenv("RULES_SERVICE_URL", "http://rules-service:8002")
-    
-    # Redis configuration
-    REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
-    REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
-    REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
-    REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
-    REDIS_IDEMPOTENCY_TTL: int = 86400  # 24 hours
-    
-    # PostgreSQL configuration
-    POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "localhost")
-    POSTGRES_PORT: int = int(os.getenv("POSTGRES_PORT", "5432"))
-    POSTGRES_DB: str = os.getenv("POSTGRES_DB", "safeguard")
-    POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
-    POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
-    POSTGRES_MAX_CONNECTIONS: int = 20
-    POSTGRES_MIN_CONNECTIONS: int = 5
-    
-    # Kafka configuration
-    KAFKA_BOOTSTRAP_SERVERS: str = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
-    KAFKA_TOPIC_DECISIONS: str = "decision_events"
-    KAFKA_TOPIC_CASES: str = "case_events"
-    KAFKA_ENABLE: bool = os.getenv("KAFKA_ENABLE", "true").lower() == "true"
-    
-    # Decision thresholds
-    THRESHOLD_LOW_RISK: float = 0.50
-    THRESHOLD_HIGH_RISK: float = 0.70
-    
-    # Tenant configuration
-    DEFAULT_TENANT_ID: str = "default"
-    
-    # Model version
-    MODEL_VERSION: str = os.getenv("MODEL_VERSION", "v1.0.0")
-    
-    # Logging
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    
-    # Metrics
-    METRICS_ENABLED: bool = True
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-
-    @property
-    def postgres_dsn(self) -> str:
-        """Generate PostgreSQL DSN."""
-        return (
-            f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
-            f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
-        )
-
-
-# Global settings instance
-settings = Settings()
+"""
+Configuration settings for Decision Engine service.
+"""
+import os
+from typing import Optional
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """Application settings loaded from environment variables."""
+    
+    # Service config
+    SERVICE_NAME: str = "decision-engine"
+    VERSION: str = "1.0.0"
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    
+    # Timeouts and budgets (milliseconds)
+    # Note: Model serving may call IP geolocation API (1-2s latency)
+    ORCHESTRATION_TIMEOUT_MS: int = 100
+    MODEL_SERVING_TIMEOUT_MS: int = 5000  # 5s for IP geolocation
+    RULES_SERVICE_TIMEOUT_MS: int = 1000
+    TOTAL_TIMEOUT_MS: int = 6000
+
+    # Upstream HTTP connection pools (one per upstream: Model Serving, Rules Service)
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 500
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 200
+    HTTP_KEEPALIVE_EXPIRY_S: float = 30.0
+    # HTTP/2 is negotiated via TLS ALPN: only effective behind an h2-capable TLS proxy
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+    
+    # Model Serving response cache (short staleness window for repeated scoring inputs)
+    MODEL_CACHE_TTL_S: float = 2.0
+    MODEL_CACHE_MAX_SIZE: int = 10000
+    
+    # Model Serving circuit breaker (consecutive failures before opening, cooldown)
+    MODEL_BREAKER_FAIL_MAX: int = 10
+    MODEL_BREAKER_RESET_S: float = 5.0
+    
+    # External services
+    MODEL_SERVING_URL: str = os.getenv("MODEL_SERVING_URL", "http://model-serving:8001")
+    RULES_SERVICE_URL: str = os.getenv("RULES_SERVICE_URL", "http://rules-service:8002")
+    
+    # Redis configuration
+    REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
+    REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
+    REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
+    REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
+    REDIS_IDEMPOTENCY_TTL: int = 86400  # 24 hours
+    # Cap on sockets per Redis client pool (guards Redis maxclients under bursts)
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "128"))
+    # How long a caller waits for a free pooled connection before erroring
+    REDIS_POOL_TIMEOUT_S: float = float(os.getenv("REDIS_POOL_TIMEOUT_S", "0.5"))
+    
+    # PostgreSQL configuration
+    POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "localhost")
+    POSTGRES_PORT: int = int(os.getenv("POSTGRES_PORT", "5432"))
+    POSTGRES_DB: str = os.getenv("POSTGRES_DB", "safeguard")
+    POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
+    POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
+    POSTGRES_MAX_CONNECTIONS: int = 20
+    POSTGRES_MIN_CONNECTIONS: int = 5
+    # asyncpg per-connection prepared statement LRU (set 0 behind pgbouncer transaction pooling)
+    POSTGRES_STATEMENT_CACHE_SIZE: int = int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", "512"))
+    # Idle pooled connections are closed after this many seconds
+    POSTGRES_MAX_INACTIVE_CONNECTION_LIFETIME_S: float = 300.0
+    # Max rows per batched INSERT round trip (events, decisions, audit logs)
+    STORAGE_BATCH_MAX_SIZE: int = 256
+    # Rows that may wait per table before writers block (backpressure)
+    STORAGE_BATCH_QUEUE_SIZE: int = 4096
+    # Audit details larger than this (estimated bytes) are signed off the event loop
+    AUDIT_SIGN_OFFLOAD_BYTES: int = 1024
+    
+    # Kafka configuration
+    KAFKA_BOOTSTRAP_SERVERS: str = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
+    KAFKA_TOPIC_DECISIONS: str = "decision_events"
+    KAFKA_TOPIC_CASES: str = "case_events"
+    KAFKA_ENABLE: bool = os.getenv("KAFKA_ENABLE", "true").lower() == "true"
+    
+    # Decision thresholds
+    THRESHOLD_LOW_RISK: float = 0.50
+    THRESHOLD_HIGH_RISK: float = 0.70
+    
+    # Tenant configuration
+    DEFAULT_TENANT_ID: str = "default"
+    
+    # Model version
+    MODEL_VERSION: str = os.getenv("MODEL_VERSION", "v1.0.0")
+    
+    # Logging
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    
+    # Metrics
+    METRICS_ENABLED: bool = True
+    
+    class Config:
+        env_file = ".env"
+        case_sensitive = True
+
+    @property
+    def postgres_dsn(self) -> str:
+        """Generate PostgreSQL DSN."""
+        return (
+            f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
+
+# Global settings instance
+settings = Settings()
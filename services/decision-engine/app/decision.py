@@ -0,0 +1,85 @@
+"""
+Decision logic for the Decision Engine.
+
+Pure, typed, I/O-free code kept apart from the async orchestration so it
+can be benchmarked and compiled (mypyc) on its own.
+"""
+from typing import List, Optional, Tuple
+
+from app.models import DecisionType
+
+# Hot-path constants (module globals instead of enum attribute lookups)
+_DENY = DecisionType.DENY
+_CHALLENGE = DecisionType.CHALLENGE
+_ALLOW = DecisionType.ALLOW
+_REASON_CRIT = "Critical security rule triggered"
+_REASON_NO_RULES = "No security rules triggered"
+_REASON_ML_FAIL = "Unable to compute risk score"
+
+# Decision table indexed by score band * 2 + has_initial_2fa:
+# (decision, reason label, fixed follow-up reason, requires_2fa)
+_BAND_LOW, _BAND_MEDIUM, _BAND_HIGH = 0, 1, 2
+_DECISION_TABLE: Tuple[Tuple[DecisionType, str, Optional[str], bool], ...] = (
+    (_ALLOW, "Low risk score", None, False),
+    (_ALLOW, "Low risk score", None, False),
+    (_CHALLENGE, "Medium risk score", "2FA required for verification", True),
+    (_ALLOW, "Medium risk score", "2FA already validated", False),
+    (_CHALLENGE, "High risk score", None, True),
+    (_CHALLENGE, "High risk score", None, True),
+)
+
+
+def make_decision(
+    score: Optional[float],
+    rule_hits: List[str],
+    is_critical: bool,
+    has_initial_2fa: bool,
+    top_features: List[str],
+    th_high: float,
+    th_low: float
+) -> Tuple[DecisionType, List[str], bool]:
+    """
+    Make final decision based on score, rules, and 2FA.
+
+    See DecisionOrchestrator._make_decision for the decision logic.
+
+    Returns:
+        Tuple of (decision, reasons, requires_2fa)
+    """
+    # Critical rules override everything
+    if is_critical:
+        if rule_hits:
+            return _DENY, [_REASON_CRIT, f"Rules: {', '.join(rule_hits[:3])}"], False
+        return _DENY, [_REASON_CRIT], False
+
+    # ML failed - fail safe
+    if score is None:
+        return _CHALLENGE, [_REASON_ML_FAIL], True
+
+    # Score band: 0 = low, 1 = medium, 2 = high
+    if score > th_high:
+        band = _BAND_HIGH
+    elif score >= th_low:
+        band = _BAND_MEDIUM
+    else:
+        band = _BAND_LOW
+
+    decision, label, note, requires_2fa = _DECISION_TABLE[band * 2 + has_initial_2fa]
+    head = f"{label}: {score:.2f}"
+
+    # Fixed-size reason lists are built as literals in one step
+    if note is not None:
+        # Medium risk: outcome depends only on 2FA
+        reasons = [head, note]
+    elif band == _BAND_HIGH:
+        reasons = [head]
+        if top_features:
+            reasons.append(f"Risk factors: {', '.join(top_features[:3])}")
+        if rule_hits:
+            reasons.append(f"Rules triggered: {', '.join(rule_hits[:3])}")
+    elif rule_hits:
+        reasons = [head, f"Minor rules triggered: {', '.join(rule_hits[:2])}"]
+    else:
+        reasons = [head, _REASON_NO_RULES]
+
+    return decision, reasons, requires_2fa
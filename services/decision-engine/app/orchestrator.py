@@ -1,332 +1,454 @@
-"""
-Orchestration logic for parallel service calls.
-"""
-import asyncio
-import httpx
-import logging
-import uuid
-from typing import Dict, Any, Optional, Tuple, List
-from datetime import datetime
-from app.config import settings
-from app.models import ScoreRequest, ScoreResponse, DecisionType
-from app.velocity import velocity_tracker
-from app.sca import create_sca_challenge, determine_sca_level, log_sca_event
-from app.storage import postgres_storage
-
-logger = logging.getLogger(__name__)
-
-
-class DecisionOrchestrator:
-    """Orchestrates parallel calls to Model Serving and Rules Service."""
-    
-    def __init__(self):
-        self.http_client: Optional[httpx.AsyncClient] = None
-    
-    async def initialize(self):
-        """Initialize HTTP client and velocity tracker."""
-        self.http_client = httpx.AsyncClient(
-            timeout=httpx.Timeout(settings.TOTAL_TIMEOUT_MS / 1000.0),
-            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
-        )
-        logger.info("Orchestrator HTTP client initialized")
-
-        # Initialize velocity tracker
-        await velocity_tracker.initialize()
-
-    async def close(self):
-        """Close HTTP client and velocity tracker."""
-        if self.http_client:
-            await self.http_client.aclose()
-            logger.info("Orchestrator HTTP client closed")
-        await velocity_tracker.close()
-    
-    async def call_model_serving(self, request: ScoreRequest) -> Tuple[Optional[float], List[str]]:
-        """
-        Call Model Serving service for ML score.
-        
-        Args:
-            request: Score request
-            
-        Returns:
-            Tuple of (score, feature_names)
-        """
-        if not self.http_client:
-            logger.error("HTTP client not initialized")
-            return None, []
-        
-        try:
-            payload = {
-                "event_id": request.event_id,
-                "amount": request.amount,
-                "currency": request.currency,
-                "merchant": request.merchant.dict(exclude_none=True),
-                "card": request.card.dict(exclude_none=True),
-                "context": request.context.dict(exclude_none=True)
-            }
-            
-            response = await self.http_client.post(
-                f"{settings.MODEL_SERVING_URL}/predict",
-                json=payload,
-                timeout=settings.MODEL_SERVING_TIMEOUT_MS / 1000.0
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            score = data.get("score")
-            features = data.get("top_features", [])
-            
-            logger.debug(f"Model serving response: score={score}")
-            return score, features
-            
-        except httpx.TimeoutException:
-            logger.error(f"Model serving timeout after {settings.MODEL_SERVING_TIMEOUT_MS}ms")
-            return None, []
-        except Exception as e:
-            logger.error(f"Error calling model serving: {e}")
-            return None, []
-    
-    async def call_rules_service(
-        self, request: ScoreRequest, velocity_data: Dict[str, Any]
-    ) -> Tuple[List[str], bool]:
-        """
-        Call Rules Service for rule evaluation.
-
-        Args:
-            request: Score request
-            velocity_data: Velocity metrics from Redis
-
-        Returns:
-            Tuple of (rule_hits, is_critical)
-        """
-        if not self.http_client:
-            logger.error("HTTP client not initialized")
-            return [], False
-
-        try:
-            # Map to rules-service expected format (EvaluationRequest)
-            # Include velocity data for velocity-based rules
-            payload = {
-                "context": {
-                    "transaction_id": request.event_id,
-                    "user_id": request.card.user_id or "unknown",
-                    "amount": request.amount,
-                    "currency": request.currency,
-                    "merchant_id": request.merchant.id,
-                    "merchant_category": request.merchant.mcc,
-                    "geo": request.merchant.country,
-                    "ip_address": request.context.ip if request.context else None,
-                    "device_id": request.context.device_id if request.context else None,
-                    "payment_method": request.card.type,
-                    # Velocity data from Redis
-                    "tx_count_1h": velocity_data.get("velocity_1h", 0),
-                    "tx_count_24h": velocity_data.get("velocity_24h", 0),
-                    "amount_sum_24h": velocity_data.get("amount_sum_24h", 0.0),
-                    "metadata": {
-                        "tenant_id": request.tenant_id,
-                        "channel": request.context.channel if request.context else None
-                    }
-                },
-                "check_lists": True
-            }
-
-            response = await self.http_client.post(
-                f"{settings.RULES_SERVICE_URL}/evaluate",
-                json=payload,
-                timeout=settings.RULES_SERVICE_TIMEOUT_MS / 1000.0
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            # Map from rules-service response to expected format
-            matched_rules = data.get("matched_rules", [])
-            rule_hits = [r.get("rule_name", r.get("rule_id", "unknown")) for r in matched_rules]
-            is_critical = data.get("should_deny", False)
-            
-            logger.debug(f"Rules service response: hits={len(rule_hits)}, critical={is_critical}")
-            return rule_hits, is_critical
-            
-        except httpx.TimeoutException:
-            logger.error(f"Rules service timeout after {settings.RULES_SERVICE_TIMEOUT_MS}ms")
-            return [], False
-        except Exception as e:
-            logger.error(f"Error calling rules service: {e}")
-            return [], False
-    
-    async def orchestrate(self, request: ScoreRequest) -> Dict[str, Any]:
-        """
-        Orchestrate parallel service calls and make decision.
-
-        Args:
-            request: Score request
-
-        Returns:
-            Decision result dictionary
-        """
-        start_time = datetime.utcnow()
-
-        # Calculate velocity first (records this transaction)
-        user_id = request.card.user_id or "unknown"
-        velocity_data = await velocity_tracker.record_transaction(
-            user_id=user_id,
-            amount=request.amount
-        )
-        logger.info(
-            f"Velocity for user {user_id}: "
-            f"1h={velocity_data['velocity_1h']}, "
-            f"24h={velocity_data['velocity_24h']}, "
-            f"sum={velocity_data['amount_sum_24h']:.2f}"
-        )
-
-        # Parallel calls to Model Serving and Rules Service
-        model_task = self.call_model_serving(request)
-        rules_task = self.call_rules_service(request, velocity_data)
-
-        (score, top_features), (rule_hits, is_critical) = await asyncio.gather(
-            model_task,
-            rules_task,
-            return_exceptions=False
-        )
-        
-        # Make decision based on score, rules, and 2FA
-        decision, reasons, requires_2fa = self._make_decision(
-            score=score,
-            rule_hits=rule_hits,
-            is_critical=is_critical,
-            has_initial_2fa=request.has_initial_2fa,
-            top_features=top_features
-        )
-
-        # PSD2/RGPD: Create SCA challenge if required
-        sca_challenge = None
-        if score is not None and score > 0.3:  # Only for non-trivial risk
-            try:
-                sca_level = determine_sca_level(
-                    risk_score=score,
-                    amount=request.amount,
-                    transaction_type="payment"
-                )
-
-                # Create SCA challenge in database
-                sca_challenge = await create_sca_challenge(
-                    pool=postgres_storage.pool,
-                    user_id=user_id,
-                    transaction_id=request.event_id,
-                    risk_score=score,
-                    amount=request.amount
-                )
-
-                # Log DPIA event for RGPD compliance
-                await log_sca_event(
-                    pool=postgres_storage.pool,
-                    event_details={
-                        "transaction_id": request.event_id,
-                        "user_id": user_id,
-                        "risk_score": score,
-                        "sca_level": sca_level.value,
-                        "amount": request.amount
-                    }
-                )
-
-                logger.info(f"SCA challenge created: {sca_level.value} for transaction {request.event_id}")
-            except Exception as e:
-                logger.error(f"Failed to create SCA challenge: {e}")
-                # Non-blocking, continue with decision
-
-        # Calculate latency
-        latency_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-
-        result = {
-            "decision": decision,
-            "score": score,
-            "rule_hits": rule_hits,
-            "reasons": reasons,
-            "requires_2fa": requires_2fa,
-            "latency_ms": latency_ms,
-            "model_version": settings.MODEL_VERSION
-        }
-
-        # Add SCA challenge if created
-        if sca_challenge:
-            result["sca_challenge"] = sca_challenge
-
-        return result
-    
-    def _make_decision(
-        self,
-        score: Optional[float],
-        rule_hits: List[str],
-        is_critical: bool,
-        has_initial_2fa: bool,
-        top_features: List[str]
-    ) -> Tuple[DecisionType, List[str], bool]:
-        """
-        Make final decision based on score, rules, and 2FA.
-        
-        Decision logic:
-        1. If critical rule triggered -> DENY
-        2. If score is None (ML failed) -> CHALLENGE (fail safe)
-        3. If score > 0.70 -> CHALLENGE or DENY
-        4. If score 0.50-0.70 and no 2FA -> CHALLENGE (request 2FA)
-        5. If score 0.50-0.70 and has 2FA -> ALLOW (2FA sufficient)
-        6. If score < 0.50 -> ALLOW
-        
-        Args:
-            score: ML score [0..1]
-            rule_hits: List of triggered rules
-            is_critical: Whether critical rule was triggered
-            has_initial_2fa: Whether 2FA was already performed
-            top_features: Top contributing features
-            
-        Returns:
-            Tuple of (decision, reasons, requires_2fa)
-        """
-        reasons = []
-        requires_2fa = False
-        
-        # Critical rules override everything
-        if is_critical:
-            reasons.append("Critical security rule triggered")
-            if rule_hits:
-                reasons.append(f"Rules: {', '.join(rule_hits[:3])}")
-            return DecisionType.DENY, reasons, False
-        
-        # ML failed - fail safe
-        if score is None:
-            reasons.append("Unable to compute risk score")
-            return DecisionType.CHALLENGE, reasons, True
-        
-        # High risk score
-        if score > settings.THRESHOLD_HIGH_RISK:
-            reasons.append(f"High risk score: {score:.2f}")
-            if top_features:
-                reasons.append(f"Risk factors: {', '.join(top_features[:3])}")
-            if rule_hits:
-                reasons.append(f"Rules triggered: {', '.join(rule_hits[:3])}")
-            return DecisionType.CHALLENGE, reasons, True
-        
-        # Medium risk score
-        if score >= settings.THRESHOLD_LOW_RISK:
-            reasons.append(f"Medium risk score: {score:.2f}")
-            
-            # If 2FA already done, allow
-            if has_initial_2fa:
-                reasons.append("2FA already validated")
-                return DecisionType.ALLOW, reasons, False
-            
-            # Otherwise request 2FA
-            reasons.append("2FA required for verification")
-            requires_2fa = True
-            return DecisionType.CHALLENGE, reasons, requires_2fa
-        
-        # Low risk - allow
-        reasons.append(f"Low risk score: {score:.2f}")
-        if rule_hits:
-            reasons.append(f"Minor rules triggered: {', '.join(rule_hits[:2])}")
-        else:
-            reasons.append("No security rules triggered")
-        
-        return DecisionType.ALLOW, reasons, False
-
-
-# Global instance
-orchestrator = DecisionOrchestrator()
+"""
+Orchestration logic for parallel service calls.
+"""
+import asyncio
+import hashlib
+import httpx
+import logging
+import operator
+import orjson
+import time
+import uuid
+from typing import Dict, Any, Optional, Set, Tuple, List
+from cachetools import TTLCache
+from prometheus_client import Counter
+from app.circuit_breaker import CircuitBreaker
+from app.config import settings
+from app.decision import make_decision
+from app.models import ScoreRequest, ScoreResponse, DecisionType
+from app.velocity import velocity_tracker
+from app.sca import (
+    SCALevel,
+    SCAStatus,
+    create_sca_challenge,
+    determine_sca_level,
+    get_sca_instructions,
+)
+from app.storage import postgres_storage
+
+logger = logging.getLogger(__name__)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# rule_name is a required field of the Rules Service MatchedRule schema
+_get_rule_name = operator.itemgetter("rule_name")
+
+# ScoreRequest fields forwarded to Model Serving
+_MODEL_PAYLOAD_FIELDS = {"event_id", "amount", "currency", "merchant", "card", "context"}
+
+MODEL_CACHE_REQUESTS = Counter(
+    'decision_engine_model_cache_requests_total',
+    'Model Serving response cache lookups',
+    ['result']
+)
+
+
+class DecisionOrchestrator:
+    """Orchestrates parallel calls to Model Serving and Rules Service."""
+    
+    def __init__(self):
+        # One pool per upstream so a slow service cannot starve the other's connections
+        self.model_client: Optional[httpx.AsyncClient] = None
+        self.rules_client: Optional[httpx.AsyncClient] = None
+        # In-flight Model Serving calls keyed by scoring-input digest (singleflight)
+        self._inflight: Dict[bytes, "asyncio.Future[Tuple[Optional[float], List[str]]]"] = {}
+        # Recent successful Model Serving results keyed by the same digest
+        self._score_cache: TTLCache = TTLCache(
+            maxsize=settings.MODEL_CACHE_MAX_SIZE,
+            ttl=settings.MODEL_CACHE_TTL_S
+        )
+        # Fails Model Serving calls fast while the upstream is down
+        self._model_breaker = CircuitBreaker(
+            "model-serving",
+            fail_max=settings.MODEL_BREAKER_FAIL_MAX,
+            reset_timeout=settings.MODEL_BREAKER_RESET_S
+        )
+        # Fire-and-forget persistence tasks (strong refs so they are not GC'd)
+        self._background_tasks: Set[asyncio.Task] = set()
+
+        # Settings-derived constants read on every decision
+        self._model_url = f"{settings.MODEL_SERVING_URL}/predict"
+        self._rules_url = f"{settings.RULES_SERVICE_URL}/evaluate"
+        self._model_timeout = settings.MODEL_SERVING_TIMEOUT_MS / 1000.0
+        self._rules_timeout = settings.RULES_SERVICE_TIMEOUT_MS / 1000.0
+        self._total_timeout = settings.TOTAL_TIMEOUT_MS / 1000.0
+        self._th_high = settings.THRESHOLD_HIGH_RISK
+        self._th_low = settings.THRESHOLD_LOW_RISK
+        self._model_version = settings.MODEL_VERSION
+    
+    @staticmethod
+    def _build_client() -> httpx.AsyncClient:
+        """Build an HTTP client with a dedicated per-upstream connection pool."""
+        return httpx.AsyncClient(
+            http2=settings.HTTP2_ENABLED,
+            timeout=httpx.Timeout(settings.TOTAL_TIMEOUT_MS / 1000.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_S
+            )
+        )
+
+    async def initialize(self):
+        """Initialize HTTP clients and velocity tracker."""
+        self.model_client = self._build_client()
+        self.rules_client = self._build_client()
+        logger.info("Orchestrator HTTP clients initialized")
+
+        # Initialize velocity tracker
+        await velocity_tracker.initialize()
+
+    async def close(self):
+        """Close HTTP clients and velocity tracker."""
+        # Let pending SCA/DPIA writes finish while the DB pool is still open
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        for client in (self.model_client, self.rules_client):
+            if client:
+                await client.aclose()
+        logger.info("Orchestrator HTTP clients closed")
+        await velocity_tracker.close()
+    
+    async def call_model_serving(self, request: ScoreRequest) -> Tuple[Optional[float], List[str]]:
+        """
+        Call Model Serving service for ML score.
+
+        Identical scoring inputs seen within MODEL_CACHE_TTL_S are served from
+        an in-process cache. Concurrent misses are coalesced: the first
+        caller issues the POST and the others await the same task.
+        
+        Args:
+            request: Score request
+            
+        Returns:
+            Tuple of (score, feature_names)
+        """
+        if not self.model_client:
+            logger.error("HTTP client not initialized")
+            return None, []
+        
+        # Single pydantic-core (Rust) serialization pass over the scoring fields
+        payload = request.model_dump(include=_MODEL_PAYLOAD_FIELDS, exclude_none=True)
+
+        # event_id does not influence the score, so it is left out of the key
+        key = hashlib.blake2b(
+            orjson.dumps(
+                [payload["amount"], payload["currency"], payload["merchant"],
+                 payload["card"], payload["context"]],
+                option=orjson.OPT_SORT_KEYS
+            ),
+            digest_size=16
+        ).digest()
+
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            MODEL_CACHE_REQUESTS.labels(result="hit").inc()
+            return cached
+        MODEL_CACHE_REQUESTS.labels(result="miss").inc()
+
+        task = self._inflight.get(key)
+        if task is None:
+            if not self._model_breaker.allow():
+                logger.warning("Model serving circuit open, skipping call")
+                return None, []
+            task = asyncio.ensure_future(self._post_model_serving(payload))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_model_call_done(key, t))
+        else:
+            logger.debug("Coalescing model serving call with in-flight request")
+
+        # Shield so a cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _on_model_call_done(self, key: bytes, task: asyncio.Future) -> None:
+        """Release the in-flight slot and cache successful scores (errors are never cached)."""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result[0] is not None:
+            self._score_cache[key] = result
+
+    async def _post_model_serving(self, payload: Dict[str, Any]) -> Tuple[Optional[float], List[str]]:
+        """POST a prepared payload to Model Serving and parse the response."""
+        reached = False
+        try:
+            response = await self.model_client.post(
+                self._model_url,
+                content=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=self._model_timeout
+            )
+            # Any HTTP response (even an error status) means the upstream is reachable
+            reached = True
+            self._model_breaker.record_success()
+            response.raise_for_status()
+            
+            data = orjson.loads(response.content)
+            score = data.get("score")
+            features = data.get("top_features", [])
+            
+            logger.debug("Model serving response: score=%s", score)
+            return score, features
+            
+        except httpx.TimeoutException:
+            logger.error(f"Model serving timeout after {settings.MODEL_SERVING_TIMEOUT_MS}ms")
+            return None, []
+        except Exception as e:
+            logger.error(f"Error calling model serving: {e}")
+            return None, []
+        finally:
+            # Every call without a response (timeouts, transport/decoding errors,
+            # cancellation) counts as a failure, so a half-open trial always ends
+            if not reached:
+                self._model_breaker.record_failure()
+    
+    async def call_rules_service(
+        self, request: ScoreRequest, velocity_data: Dict[str, Any], user_id: str
+    ) -> Tuple[List[str], bool]:
+        """
+        Call Rules Service for rule evaluation.
+
+        Args:
+            request: Score request
+            velocity_data: Velocity metrics from Redis
+            user_id: Card holder ID (already resolved by orchestrate)
+
+        Returns:
+            Tuple of (rule_hits, is_critical)
+        """
+        if not self.rules_client:
+            logger.error("HTTP client not initialized")
+            return [], False
+
+        try:
+            # Map to rules-service expected format (EvaluationRequest)
+            # Include velocity data for velocity-based rules
+            ctx = request.context
+            payload = {
+                "context": {
+                    "transaction_id": request.event_id,
+                    "user_id": user_id,
+                    "amount": request.amount,
+                    "currency": request.currency,
+                    "merchant_id": request.merchant.id,
+                    "merchant_category": request.merchant.mcc,
+                    "geo": request.merchant.country,
+                    "ip_address": ctx.ip if ctx else None,
+                    "device_id": ctx.device_id if ctx else None,
+                    "payment_method": request.card.type,
+                    # Velocity data from Redis
+                    "tx_count_1h": velocity_data.get("velocity_1h", 0),
+                    "tx_count_24h": velocity_data.get("velocity_24h", 0),
+                    "amount_sum_24h": velocity_data.get("amount_sum_24h", 0.0),
+                    "metadata": {
+                        "tenant_id": request.tenant_id,
+                        "channel": ctx.channel if ctx else None
+                    }
+                },
+                "check_lists": True
+            }
+
+            response = await self.rules_client.post(
+                self._rules_url,
+                content=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=self._rules_timeout
+            )
+            response.raise_for_status()
+
+            data = orjson.loads(response.content)
+            # Map from rules-service response to expected format
+            matched_rules = data.get("matched_rules", [])
+            try:
+                rule_hits = list(map(_get_rule_name, matched_rules))
+            except KeyError:
+                rule_hits = [r.get("rule_name", r.get("rule_id", "unknown")) for r in matched_rules]
+            is_critical = data.get("should_deny", False)
+            
+            logger.debug("Rules service response: hits=%d, critical=%s", len(rule_hits), is_critical)
+            return rule_hits, is_critical
+            
+        except httpx.TimeoutException:
+            logger.error(f"Rules service timeout after {settings.RULES_SERVICE_TIMEOUT_MS}ms")
+            return [], False
+        except Exception as e:
+            logger.error(f"Error calling rules service: {e}")
+            return [], False
+    
+    async def orchestrate(self, request: ScoreRequest) -> Dict[str, Any]:
+        """
+        Orchestrate parallel service calls and make decision.
+
+        Args:
+            request: Score request
+
+        Returns:
+            Decision result dictionary
+        """
+        start_ns = time.perf_counter_ns()
+
+        # Model Serving does not need velocity, so start it first and record
+        # velocity (Redis) while the ML call is in flight
+        model_fut = asyncio.ensure_future(self.call_model_serving(request))
+
+        # Hard wall-clock cap on the whole upstream stage; per-call timeouts
+        # alone do not bound velocity + rules + model end to end
+        user_id = request.card.user_id or "unknown"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._total_timeout
+        try:
+            rule_hits, is_critical = await asyncio.wait_for(
+                self._collect_rules(request, user_id),
+                timeout=self._total_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Rules stage timeout after {settings.TOTAL_TIMEOUT_MS}ms")
+            rule_hits, is_critical = [], False
+
+        # The model gets whatever remains of the budget; a slow model only
+        # drops the score, never rule hits that already came back
+        try:
+            score, top_features = await asyncio.wait_for(
+                model_fut,
+                timeout=max(deadline - loop.time(), 0.0)
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Model serving timeout after {settings.TOTAL_TIMEOUT_MS}ms total budget")
+            score, top_features = None, []
+        
+        # Make decision based on score, rules, and 2FA
+        decision, reasons, requires_2fa = self._make_decision(
+            score=score,
+            rule_hits=rule_hits,
+            is_critical=is_critical,
+            has_initial_2fa=request.has_initial_2fa,
+            top_features=top_features
+        )
+
+        # PSD2/RGPD: Create SCA challenge if required. The challenge and DPIA
+        # inserts do not affect the decision, so they run in the background
+        sca_challenge = None
+        if score is not None and score > 0.3:  # Only for non-trivial risk
+            sca_level = determine_sca_level(
+                risk_score=score,
+                amount=request.amount,
+                transaction_type="payment"
+            )
+            sca_challenge = {
+                "challenge_type": sca_level.value,
+                "status": SCAStatus.PENDING.value,
+                "instructions": get_sca_instructions(sca_level)
+            }
+            self._spawn_background(self._persist_sca(request, user_id, score, sca_level))
+
+        # Calculate latency
+        latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+
+        result = {
+            "decision": decision,
+            "score": score,
+            "rule_hits": rule_hits,
+            "reasons": reasons,
+            "requires_2fa": requires_2fa,
+            "latency_ms": latency_ms,
+            "model_version": self._model_version
+        }
+
+        # Add pending SCA challenge (persisted asynchronously)
+        if sca_challenge:
+            result["sca_challenge"] = sca_challenge
+
+        return result
+    
+    async def _collect_rules(self, request: ScoreRequest, user_id: str) -> Tuple[List[str], bool]:
+        """Record velocity, then evaluate the rules (overlapping the in-flight model call)."""
+        # Record this transaction and get velocity counters for the rules
+        velocity_data = await velocity_tracker.record_transaction(
+            user_id=user_id,
+            amount=request.amount
+        )
+        logger.info(
+            "Velocity for user %s: 1h=%s, 24h=%s, sum=%.2f",
+            user_id,
+            velocity_data['velocity_1h'],
+            velocity_data['velocity_24h'],
+            velocity_data['amount_sum_24h']
+        )
+
+        # Rules Service is gated on velocity only; it overlaps the ML call
+        return await self.call_rules_service(request, velocity_data, user_id)
+
+    def _spawn_background(self, coro) -> None:
+        """Run a coroutine off the request path, keeping a strong reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _persist_sca(
+        self, request: ScoreRequest, user_id: str, score: float, sca_level: SCALevel
+    ) -> None:
+        """Create the SCA challenge and log the DPIA event (non-blocking for the decision)."""
+        try:
+            # Create SCA challenge in database
+            await create_sca_challenge(
+                pool=postgres_storage.pool,
+                user_id=user_id,
+                transaction_id=request.event_id,
+                risk_score=score,
+                amount=request.amount
+            )
+
+            # Log DPIA event for RGPD compliance (batched COPY into dpia_logs)
+            await postgres_storage.store_dpia_event(
+                "SCA_TRIGGERED",
+                {
+                    "transaction_id": request.event_id,
+                    "user_id": user_id,
+                    "risk_score": score,
+                    "sca_level": sca_level.value,
+                    "amount": request.amount
+                }
+            )
+
+            logger.info(f"SCA challenge created: {sca_level.value} for transaction {request.event_id}")
+        except Exception as e:
+            logger.error(f"Failed to create SCA challenge: {e}")
+
+    def _make_decision(
+        self,
+        score: Optional[float],
+        rule_hits: List[str],
+        is_critical: bool,
+        has_initial_2fa: bool,
+        top_features: List[str]
+    ) -> Tuple[DecisionType, List[str], bool]:
+        """
+        Make final decision based on score, rules, and 2FA.
+        
+        Decision logic:
+        1. If critical rule triggered -> DENY
+        2. If score is None (ML failed) -> CHALLENGE (fail safe)
+        3. If score > 0.70 -> CHALLENGE or DENY
+        4. If score 0.50-0.70 and no 2FA -> CHALLENGE (request 2FA)
+        5. If score 0.50-0.70 and has 2FA -> ALLOW (2FA sufficient)
+        6. If score < 0.50 -> ALLOW
+        
+        Args:
+            score: ML score [0..1]
+            rule_hits: List of triggered rules
+            is_critical: Whether critical rule was triggered
+            has_initial_2fa: Whether 2FA was already performed
+            top_features: Top contributing features
+            
+        Returns:
+            Tuple of (decision, reasons, requires_2fa)
+        """
+        return make_decision(
+            score, rule_hits, is_critical, has_initial_2fa, top_features,
+            self._th_high, self._th_low
+        )
+
+
+# Global instance
+orchestrator = DecisionOrchestrator()
@@ -1,281 +1,629 @@
-"""
-PostgreSQL storage for events and decisions.
-"""
-import asyncpg
-import logging
-import json
-import hashlib
-from typing import Optional, Dict, Any
-from datetime import datetime
-from app.config import settings
-from app.audit import create_audit_entry, sign_audit_log
-
-logger = logging.getLogger(__name__)
-
-
-class PostgresStorage:
-    """PostgreSQL storage handler."""
-    
-    def __init__(self):
-        self.pool: Optional[asyncpg.Pool] = None
-    
-    async def connect(self):
-        """Create connection pool."""
-        try:
-            self.pool = await asyncpg.create_pool(
-                host=settings.POSTGRES_HOST,
-                port=settings.POSTGRES_PORT,
-                database=settings.POSTGRES_DB,
-                user=settings.POSTGRES_USER,
-                password=settings.POSTGRES_PASSWORD,
-                min_size=settings.POSTGRES_MIN_CONNECTIONS,
-                max_size=settings.POSTGRES_MAX_CONNECTIONS,
-                command_timeout=10
-            )
-            logger.info("Connected to PostgreSQL")
-        except Exception as e:
-            logger.error(f"Failed to connect to PostgreSQL: {e}")
-            raise
-    
-    async def close(self):
-        """Close connection pool."""
-        if self.pool:
-            await self.pool.close()
-            logger.info("Closed PostgreSQL connection pool")
-    
-    def compute_hash(self, event_id: str, tenant_id: str, ts: datetime, payload: Dict[str, Any]) -> str:
-        """Compute SHA256 hash for integrity."""
-        content = f"{event_id}{tenant_id}{ts.isoformat()}{json.dumps(payload, sort_keys=True)}"
-        return hashlib.sha256(content.encode()).hexdigest()
-    
-    async def store_event(
-        self,
-        event_id: str,
-        tenant_id: str,
-        event_type: str,
-        payload: Dict[str, Any],
-        idem_key: str
-    ) -> bool:
-        """
-        Store transaction event.
-        
-        Args:
-            event_id: Unique event identifier
-            tenant_id: Tenant identifier
-            event_type: Type of event (e.g., 'card_payment')
-            payload: Full event payload
-            idem_key: Idempotency key
-            
-        Returns:
-            True if stored successfully
-        """
-        if not self.pool:
-            logger.error("PostgreSQL pool not initialized")
-            return False
-        
-        try:
-            ts = datetime.utcnow()
-            event_hash = self.compute_hash(event_id, tenant_id, ts, payload)
-            
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO events (event_id, tenant_id, ts, type, payload_json, idem_key, hash, created_at)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    ON CONFLICT (event_id) DO NOTHING
-                    """,
-                    event_id,
-                    tenant_id,
-                    ts,
-                    event_type,
-                    json.dumps(payload),
-                    idem_key,
-                    bytes.fromhex(event_hash),
-                    ts
-                )
-            
-            logger.debug(f"Stored event: {event_id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error storing event {event_id}: {e}")
-            return False
-    
-    async def store_decision(
-        self,
-        decision_id: str,
-        event_id: str,
-        tenant_id: str,
-        decision: str,
-        score: Optional[float],
-        rule_hits: list,
-        reasons: list,
-        latency_ms: int,
-        model_version: str,
-        thresholds: Optional[Dict[str, Any]] = None
-    ) -> bool:
-        """
-        Store fraud decision.
-        
-        Args:
-            decision_id: Unique decision identifier
-            event_id: Related event ID
-            tenant_id: Tenant identifier
-            decision: ALLOW, CHALLENGE, or DENY
-            score: ML score [0..1]
-            rule_hits: List of rule IDs triggered
-            reasons: Human-readable reasons
-            latency_ms: Processing latency
-            model_version: ML model version
-            thresholds: Decision thresholds used
-            
-        Returns:
-            True if stored successfully
-        """
-        if not self.pool:
-            logger.error("PostgreSQL pool not initialized")
-            return False
-        
-        try:
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO decisions 
-                    (decision_id, event_id, tenant_id, decision, score, rule_hits, reasons, 
-                     thresholds, latency_ms, model_version, created_at)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-                    """,
-                    decision_id,
-                    event_id,
-                    tenant_id,
-                    decision,
-                    score,
-                    rule_hits,
-                    reasons,
-                    json.dumps(thresholds) if thresholds else None,
-                    latency_ms,
-                    model_version,
-                    datetime.utcnow()
-                )
-            
-            logger.debug(f"Stored decision: {decision_id} -> {decision}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error storing decision {decision_id}: {e}")
-            return False
-    
-    async def get_decision(self, decision_id: str) -> Optional[Dict[str, Any]]:
-        """
-        Retrieve decision by ID.
-
-        Args:
-            decision_id: Decision identifier
-
-        Returns:
-            Decision record or None
-        """
-        if not self.pool:
-            return None
-
-        try:
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow(
-                    """
-                    SELECT decision_id, event_id, tenant_id, decision, score,
-                           rule_hits, reasons, latency_ms, model_version, created_at
-                    FROM decisions
-                    WHERE decision_id = $1
-                    """,
-                    decision_id
-                )
-
-            if row:
-                return dict(row)
-            return None
-
-        except Exception as e:
-            logger.error(f"Error retrieving decision {decision_id}: {e}")
-            return None
-
-    async def store_audit_log(
-        self,
-        actor: str,
-        action: str,
-        entity: str,
-        entity_id: str,
-        details: Optional[Dict[str, Any]] = None,
-        ip_address: Optional[str] = None
-    ) -> bool:
-        """
-        Store audit log entry with HMAC-SHA256 signature.
-
-        Args:
-            actor: Who performed the action (service, user, system)
-            action: What action was performed
-            entity: What type of entity was affected
-            entity_id: ID of the affected entity
-            details: Additional details (optional)
-            ip_address: IP address of the actor (optional)
-
-        Returns:
-            True if stored successfully
-
-        Example:
-            >>> await storage.store_audit_log(
-            ...     actor="decision-engine",
-            ...     action="SCORE_TRANSACTION",
-            ...     entity="transaction",
-            ...     entity_id="txn_123",
-            ...     details={"score": 0.85, "decision": "REVIEW"}
-            ... )
-        """
-        if not self.pool:
-            logger.error("PostgreSQL pool not initialized")
-            return False
-
-        # Create audit entry with HMAC signature
-        audit_entry = create_audit_entry(
-            actor=actor,
-            action=action,
-            entity=entity,
-            entity_id=entity_id,
-            details=details,
-            ip_address=ip_address
-        )
-
-        try:
-            # Prepare before/after based on details
-            before_data = None
-            after_data = details if details else {}
-
-            # Add ip_address to after_data if provided
-            if ip_address:
-                after_data["ip_address"] = ip_address
-
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO audit_logs
-                    (actor, action, entity, entity_id, before, after, signature, ts)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7::bytea, NOW())
-                    """,
-                    audit_entry["actor"],
-                    audit_entry["action"],
-                    audit_entry["entity"],
-                    audit_entry["entity_id"],
-                    json.dumps(before_data) if before_data else None,
-                    json.dumps(after_data),
-                    audit_entry["signature"].encode('utf-8')  # Convert hex string to bytea
-                )
-
-            logger.debug(f"Stored audit log: {action} on {entity}:{entity_id} by {actor} (signature: {audit_entry['signature'][:16]}...)")
-            return True
-
-        except Exception as e:
-            logger.error(f"Error storing audit log: {e}")
-            return False
-
-
-# Global instance
-postgres_storage = PostgresStorage()
+"""
+PostgreSQL storage for events and decisions.
+"""
+import asyncio
+import asyncpg
+import functools
+import logging
+import hashlib
+import orjson
+from typing import Optional, Dict, Any, List, Set, Tuple
+from datetime import datetime
+from app.config import settings
+from app.audit import create_audit_entry, sign_audit_log
+
+logger = logging.getLogger(__name__)
+
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (event_id, tenant_id, ts, type, payload_json, idem_key, hash, created_at)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+    ON CONFLICT (event_id) DO NOTHING
+"""
+
+_INSERT_DECISION_SQL = """
+    INSERT INTO decisions 
+    (decision_id, event_id, tenant_id, decision, score, rule_hits, reasons, 
+     thresholds, latency_ms, model_version, created_at)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, NOW())
+"""
+
+_SELECT_DECISION_SQL = """
+    SELECT decision_id, event_id, tenant_id, decision, score,
+           rule_hits, reasons, latency_ms, model_version, created_at
+    FROM decisions
+    WHERE decision_id = $1
+"""
+
+_SELECT_SCA_STATUS_SQL = "SELECT status FROM sca_challenges WHERE challenge_id = $1"
+
+_SELECT_SCA_DONE_SQL = """
+    SELECT challenge_id FROM sca_challenges
+    WHERE challenge_id = ANY($1::bigint[]) AND status <> 'PENDING'
+"""
+
+# NOTIFY channel fed by the sca_challenges status trigger (V008)
+_SCA_COMPLETED_CHANNEL = "sca_completed"
+
+# LISTEN connection health probe period and reconnect backoff (seconds)
+_LISTENER_PROBE_S = 5.0
+_LISTENER_RETRY_S = 1.0
+
+# Append-only tables written with COPY (no conflicts). ts is left out so its
+# DEFAULT NOW() stamps rows with the database clock, as the INSERTs did
+_AUDIT_COLUMNS = ("actor", "action", "entity", "entity_id", "before", "after", "signature")
+_DPIA_COLUMNS = ("event", "details")
+
+
+class _InsertBatcher:
+    """
+    Coalesces concurrent single-row INSERTs into one round trip per batch.
+
+    Rows queued while a batch is being written go out together in the next
+    one, so batches grow with load without adding latency when idle. Each
+    caller still awaits its own row. Batches are written with executemany
+    on `sql`, or with COPY on `columns` for append-only tables.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        max_batch: int,
+        sql: Optional[str] = None,
+        columns: Optional[Tuple[str, ...]] = None
+    ):
+        self.table = table
+        self.max_batch = max_batch
+        self.sql = sql
+        self.columns = columns
+        self._pool: Optional[asyncpg.Pool] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, pool: asyncpg.Pool):
+        """Start the writer task on the given pool."""
+        self._pool = pool
+        # Bounded so a stalled database applies backpressure to writers
+        self._queue = asyncio.Queue(maxsize=settings.STORAGE_BATCH_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Write any queued rows, then stop the writer task."""
+        if self._task is None:
+            return
+        # Detach the queue first so later submits fail fast
+        queue, self._queue = self._queue, None
+        await queue.put(None)
+        await self._task
+        self._task = None
+        # Rows that slipped in behind the stop marker are failed, not left waiting
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                _set_future(item[1], RuntimeError(f"{self.table} writer stopped"))
+
+    async def submit(self, *args) -> None:
+        """Queue one row and wait until it is written (raises on failure)."""
+        if self._queue is None:
+            raise RuntimeError(f"{self.table} writer is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((args, future))
+        await future
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            batch: List[Tuple[tuple, asyncio.Future]] = []
+            item = await queue.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.max_batch or queue.empty():
+                    break
+                item = queue.get_nowait()
+            if batch:
+                await self._flush(batch)
+            if item is None:
+                return
+
+    async def _flush(self, batch: List[Tuple[tuple, asyncio.Future]]):
+        try:
+            async with self._pool.acquire() as conn:
+                # executemany and COPY are atomic: one bad row fails the whole batch
+                await self._write(conn, [args for args, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                _set_future(batch[0][1], e)
+                return
+            logger.warning(
+                "Batch insert into %s failed (%s), retrying %d rows one by one",
+                self.table, e, len(batch)
+            )
+            for args, future in batch:
+                try:
+                    async with self._pool.acquire() as conn:
+                        await self._write(conn, [args])
+                except Exception as row_error:
+                    _set_future(future, row_error)
+                else:
+                    _set_future(future)
+            return
+
+        for _, future in batch:
+            _set_future(future)
+
+    async def _write(self, conn: asyncpg.Connection, rows: List[tuple]):
+        if self.columns is not None:
+            await conn.copy_records_to_table(self.table, records=rows, columns=self.columns)
+        else:
+            await conn.executemany(self.sql, rows)
+
+
+def _estimate_details_size(details: Dict[str, Any]) -> int:
+    """Rough size of audit details in bytes, without serializing them.
+
+    Strings and bytes count their length; containers count 64 bytes per
+    entry; scalars count 16. Only top-level values are inspected.
+    """
+    size = 0
+    for key, value in details.items():
+        size += len(key) if isinstance(key, str) else 16
+        if isinstance(value, (str, bytes)):
+            size += len(value)
+        elif isinstance(value, (dict, list, tuple, set)):
+            size += 64 * len(value)
+        else:
+            size += 16
+    return size
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Encode a jsonb parameter (binary format: version byte + JSON text)."""
+    if isinstance(value, bytes):
+        # Already serialized by the caller
+        return b"\x01" + value
+    return b"\x01" + orjson.dumps(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    """Decode a binary jsonb value."""
+    return orjson.loads(data[1:])
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Per-connection setup: dicts/lists are sent as jsonb directly via orjson."""
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema="pg_catalog",
+        format="binary"
+    )
+
+
+def _set_future(future: asyncio.Future, error: Optional[BaseException] = None):
+    """Resolve a row future unless its caller has already gone away."""
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+def _db_safe(return_on_error: Any = None):
+    """
+    Decorate a storage coroutine so database errors are logged, not raised.
+
+    The wrapped method returns `return_on_error` on any exception, keeping
+    the request path alive when PostgreSQL misbehaves.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                logger.error("PostgreSQL %s failed", func.__name__, exc_info=True)
+                return return_on_error
+        return wrapper
+    return decorator
+
+
+class PostgresStorage:
+    """PostgreSQL storage handler."""
+    
+    def __init__(self):
+        self.pool: Optional[asyncpg.Pool] = None
+        batch_size = settings.STORAGE_BATCH_MAX_SIZE
+        self._event_writer = _InsertBatcher("events", batch_size, sql=_INSERT_EVENT_SQL)
+        self._decision_writer = _InsertBatcher("decisions", batch_size, sql=_INSERT_DECISION_SQL)
+        self._audit_writer = _InsertBatcher("audit_logs", batch_size, columns=_AUDIT_COLUMNS)
+        self._dpia_writer = _InsertBatcher("dpia_logs", batch_size, columns=_DPIA_COLUMNS)
+        self._writers = (self._event_writer, self._decision_writer, self._audit_writer, self._dpia_writer)
+        # Serializes connect() so concurrent/repeated startup shares one pool
+        self._connect_lock = asyncio.Lock()
+        # Dedicated LISTEN connection and the callers waiting on each SCA challenge
+        self._listener: Optional[asyncpg.Connection] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._sca_waiters: Dict[int, Set[asyncio.Future]] = {}
+    
+    async def connect(self):
+        """Create connection pool (no-op if already connected)."""
+        async with self._connect_lock:
+            if self.pool is not None:
+                return
+            await self._create_pool()
+
+    async def _create_pool(self):
+        try:
+            self.pool = await asyncpg.create_pool(
+                host=settings.POSTGRES_HOST,
+                port=settings.POSTGRES_PORT,
+                database=settings.POSTGRES_DB,
+                user=settings.POSTGRES_USER,
+                password=settings.POSTGRES_PASSWORD,
+                min_size=settings.POSTGRES_MIN_CONNECTIONS,
+                max_size=settings.POSTGRES_MAX_CONNECTIONS,
+                command_timeout=10,
+                # Statements are prepared once per connection and reused by SQL text
+                statement_cache_size=settings.POSTGRES_STATEMENT_CACHE_SIZE,
+                max_inactive_connection_lifetime=settings.POSTGRES_MAX_INACTIVE_CONNECTION_LIFETIME_S,
+                init=_init_connection,
+                server_settings={
+                    # Identifies our backends in pg_stat_activity
+                    "application_name": settings.SERVICE_NAME,
+                    # Short OLTP statements never benefit from JIT compilation
+                    "jit": "off"
+                }
+            )
+            for writer in self._writers:
+                writer.start(self.pool)
+            self._listener = await self._connect_listener()
+            self._listener_task = asyncio.create_task(self._supervise_listener())
+            logger.info("Connected to PostgreSQL")
+        except Exception as e:
+            logger.error(f"Failed to connect to PostgreSQL: {e}")
+            raise
+    
+    async def close(self):
+        """Close connection pool."""
+        if self.pool:
+            # Flush batched writes before the pool goes away
+            for writer in self._writers:
+                await writer.stop()
+            if self._listener_task is not None:
+                self._listener_task.cancel()
+                try:
+                    await self._listener_task
+                except asyncio.CancelledError:
+                    pass
+                self._listener_task = None
+            if self._listener is not None:
+                await self._listener.close()
+                self._listener = None
+            await self.pool.close()
+            self.pool = None
+            logger.info("Closed PostgreSQL connection pool")
+    
+    async def _connect_listener(self) -> asyncpg.Connection:
+        """Open the LISTEN connection (outside the pool: LISTEN is per connection)."""
+        conn = await asyncpg.connect(
+            host=settings.POSTGRES_HOST,
+            port=settings.POSTGRES_PORT,
+            database=settings.POSTGRES_DB,
+            user=settings.POSTGRES_USER,
+            password=settings.POSTGRES_PASSWORD,
+            server_settings={"application_name": f"{settings.SERVICE_NAME}-listener"}
+        )
+        await conn.add_listener(_SCA_COMPLETED_CHANNEL, self._on_sca_completed)
+        return conn
+
+    async def _supervise_listener(self):
+        """Keep the LISTEN connection alive, reconnecting after it drops."""
+        while True:
+            await self._watch_listener(self._listener)
+            logger.warning("SCA listener connection lost, reconnecting")
+            self._listener = None
+            while self._listener is None:
+                try:
+                    self._listener = await self._connect_listener()
+                except Exception as e:
+                    logger.warning(f"SCA listener reconnect failed: {e}")
+                    await asyncio.sleep(_LISTENER_RETRY_S)
+            logger.info("SCA listener reconnected")
+            # Notifications sent while disconnected are lost: re-check the waiters
+            await self._wake_completed_sca_waiters()
+
+    async def _watch_listener(self, conn: asyncpg.Connection):
+        """Return once the connection is closed or stops answering probes."""
+        lost = asyncio.get_running_loop().create_future()
+        conn.add_termination_listener(lambda _conn: _set_future(lost))
+        while not lost.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(lost), _LISTENER_PROBE_S)
+            except asyncio.TimeoutError:
+                # Server restarts and idle drops do not always close the socket
+                try:
+                    await conn.execute("SELECT 1", timeout=_LISTENER_PROBE_S)
+                except Exception as e:
+                    logger.warning(f"SCA listener probe failed: {e}")
+                    conn.terminate()
+                    return
+
+    async def _wake_completed_sca_waiters(self):
+        """Wake waiters whose challenge completed while no listener was connected."""
+        if not self._sca_waiters:
+            return
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(_SELECT_SCA_DONE_SQL, list(self._sca_waiters))
+        except Exception as e:
+            logger.error(f"Failed to re-check pending SCA challenges: {e}")
+            return
+        for row in rows:
+            for future in self._sca_waiters.pop(row["challenge_id"], ()):
+                _set_future(future)
+
+    def _on_sca_completed(self, conn, pid, channel, payload):
+        """Wake every caller waiting on the notified challenge."""
+        for future in self._sca_waiters.pop(int(payload), ()):
+            _set_future(future)
+
+    async def await_sca_completion(self, challenge_id: int, timeout: float) -> bool:
+        """
+        Wait until an SCA challenge leaves PENDING (event-driven, no polling).
+
+        Args:
+            challenge_id: SCA challenge ID
+            timeout: Maximum wait in seconds
+
+        Returns:
+            True if the challenge was completed/failed within the timeout
+        """
+        # A waiter registered while the listener reconnects is woken by the re-check
+        if not self.pool or self._listener_task is None:
+            logger.error("PostgreSQL pool not initialized")
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._sca_waiters.setdefault(challenge_id, set())
+        waiters.add(future)
+        try:
+            # Registered before reading so a completion in between is not missed
+            async with self.pool.acquire() as conn:
+                status = await conn.fetchval(_SELECT_SCA_STATUS_SQL, challenge_id)
+            if status is None:
+                return False
+            if status != "PENDING":
+                return True
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters.discard(future)
+            if not waiters and self._sca_waiters.get(challenge_id) is waiters:
+                del self._sca_waiters[challenge_id]
+
+    def compute_hash(self, event_id: str, tenant_id: str, ts: datetime, payload_json: bytes) -> bytes:
+        """Compute raw SHA256 digest for integrity over the canonical (sorted-key) payload JSON."""
+        h = hashlib.sha256()
+        h.update(event_id.encode())
+        h.update(tenant_id.encode())
+        h.update(ts.isoformat().encode())
+        h.update(payload_json)
+        return h.digest()
+    
+    @_db_safe(return_on_error=False)
+    async def store_event(
+        self,
+        event_id: str,
+        tenant_id: str,
+        event_type: str,
+        payload: Dict[str, Any],
+        idem_key: str
+    ) -> bool:
+        """
+        Store transaction event.
+        
+        Args:
+            event_id: Unique event identifier
+            tenant_id: Tenant identifier
+            event_type: Type of event (e.g., 'card_payment')
+            payload: Full event payload
+            idem_key: Idempotency key
+            
+        Returns:
+            True if stored successfully
+        """
+        if not self.pool:
+            logger.error("PostgreSQL pool not initialized")
+            return False
+        
+        ts = datetime.utcnow()
+        # Serialized once: hashed and stored as the JSONB payload
+        payload_json = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        event_hash = self.compute_hash(event_id, tenant_id, ts, payload_json)
+
+        await self._event_writer.submit(
+            event_id,
+            tenant_id,
+            ts,
+            event_type,
+            payload_json,
+            idem_key,
+            event_hash,
+            ts
+        )
+
+        logger.debug(f"Stored event: {event_id}")
+        return True
+    
+    @_db_safe(return_on_error=False)
+    async def store_decision(
+        self,
+        decision_id: str,
+        event_id: str,
+        tenant_id: str,
+        decision: str,
+        score: Optional[float],
+        rule_hits: list,
+        reasons: list,
+        latency_ms: int,
+        model_version: str,
+        thresholds: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Store fraud decision.
+        
+        Args:
+            decision_id: Unique decision identifier
+            event_id: Related event ID
+            tenant_id: Tenant identifier
+            decision: ALLOW, CHALLENGE, or DENY
+            score: ML score [0..1]
+            rule_hits: List of rule IDs triggered
+            reasons: Human-readable reasons
+            latency_ms: Processing latency
+            model_version: ML model version
+            thresholds: Decision thresholds used
+            
+        Returns:
+            True if stored successfully
+        """
+        if not self.pool:
+            logger.error("PostgreSQL pool not initialized")
+            return False
+        
+        await self._decision_writer.submit(
+            decision_id,
+            event_id,
+            tenant_id,
+            decision,
+            score,
+            rule_hits,
+            reasons,
+            thresholds or None,
+            latency_ms,
+            model_version
+        )
+
+        logger.debug(f"Stored decision: {decision_id} -> {decision}")
+        return True
+    
+    @_db_safe(return_on_error=None)
+    async def get_decision(self, decision_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve decision by ID.
+
+        Args:
+            decision_id: Decision identifier
+
+        Returns:
+            Decision record or None
+        """
+        if not self.pool:
+            return None
+
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(_SELECT_DECISION_SQL, decision_id)
+
+        if row:
+            return dict(row)
+        return None
+
+    @_db_safe(return_on_error=False)
+    async def store_audit_log(
+        self,
+        actor: str,
+        action: str,
+        entity: str,
+        entity_id: str,
+        details: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None
+    ) -> bool:
+        """
+        Store audit log entry with HMAC-SHA256 signature.
+
+        Args:
+            actor: Who performed the action (service, user, system)
+            action: What action was performed
+            entity: What type of entity was affected
+            entity_id: ID of the affected entity
+            details: Additional details (optional)
+            ip_address: IP address of the actor (optional)
+
+        Returns:
+            True if stored successfully
+
+        Example:
+            >>> await storage.store_audit_log(
+            ...     actor="decision-engine",
+            ...     action="SCORE_TRANSACTION",
+            ...     entity="transaction",
+            ...     entity_id="txn_123",
+            ...     details={"score": 0.85, "decision": "REVIEW"}
+            ... )
+        """
+        if not self.pool:
+            logger.error("PostgreSQL pool not initialized")
+            return False
+
+        # Create audit entry with HMAC signature. Canonical JSON + HMAC over a
+        # large payload would stall the event loop, so those go to a thread
+        make_entry = functools.partial(
+            create_audit_entry,
+            actor=actor,
+            action=action,
+            entity=entity,
+            entity_id=entity_id,
+            details=details,
+            ip_address=ip_address
+        )
+        if details and _estimate_details_size(details) > settings.AUDIT_SIGN_OFFLOAD_BYTES:
+            audit_entry = await asyncio.get_running_loop().run_in_executor(None, make_entry)
+        else:
+            audit_entry = make_entry()
+
+        # Prepare before/after based on details
+        before_data = None
+        after_data = details if details else {}
+
+        # Add ip_address to after_data if provided
+        if ip_address:
+            after_data["ip_address"] = ip_address
+
+        await self._audit_writer.submit(
+            audit_entry["actor"],
+            audit_entry["action"],
+            audit_entry["entity"],
+            audit_entry["entity_id"],
+            before_data or None,
+            after_data,
+            audit_entry["signature"].encode('utf-8')  # Convert hex string to bytea
+        )
+
+        logger.debug(f"Stored audit log: {action} on {entity}:{entity_id} by {actor} (signature: {audit_entry['signature'][:16]}...)")
+        return True
+
+    @_db_safe(return_on_error=False)
+    async def store_dpia_event(self, event: str, details: Dict[str, Any]) -> bool:
+        """
+        Store a DPIA log entry (RGPD compliance).
+
+        Args:
+            event: DPIA event type (e.g. 'SCA_TRIGGERED')
+            details: Event details
+
+        Returns:
+            True if stored successfully
+        """
+        if not self.pool:
+            logger.error("PostgreSQL pool not initialized")
+            return False
+
+        await self._dpia_writer.submit(event, details)
+        return True
+
+
+# Global instance
+postgres_storage = PostgresStorage()
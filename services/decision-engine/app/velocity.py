@@ -1,181 +1,232 @@
-"""
-Velocity calculation module using Redis.
-Tracks transaction frequency per user for fraud detection.
-"""
-import logging
-import time
-from typing import Optional, Dict
-import redis.asyncio as redis
-
-from app.config import settings
-
-logger = logging.getLogger(__name__)
-
-
-class VelocityTracker:
-    """Tracks transaction velocity per user using Redis."""
-
-    # Time windows in seconds
-    WINDOW_1H = 3600      # 1 hour
-    WINDOW_24H = 86400    # 24 hours
-
-    def __init__(self):
-        self.redis_client: Optional[redis.Redis] = None
-        self.connected = False
-
-    async def initialize(self):
-        """Initialize Redis connection."""
-        try:
-            self.redis_client = redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                db=settings.REDIS_DB,
-                password=settings.REDIS_PASSWORD,
-                decode_responses=True,
-                socket_connect_timeout=2.0
-            )
-            # Test connection
-            await self.redis_client.ping()
-            self.connected = True
-            logger.info(f"Velocity tracker connected to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
-        except Exception as e:
-            logger.warning(f"Failed to connect to Redis for velocity: {e}")
-            self.connected = False
-
-    async def close(self):
-        """Close Redis connection."""
-        if self.redis_client:
-            await self.redis_client.close()
-            logger.info("Velocity tracker Redis connection closed")
-
-    def _get_key(self, user_id: str, window: str) -> str:
-        """Generate Redis key for user velocity."""
-        return f"velocity:{user_id}:{window}"
-
-    async def record_transaction(self, user_id: str, amount: float) -> Dict[str, int]:
-        """
-        Record a transaction and return current velocity counts.
-
-        Args:
-            user_id: User identifier
-            amount: Transaction amount
-
-        Returns:
-            Dict with velocity_1h and velocity_24h counts
-        """
-        if not self.connected or not self.redis_client:
-            logger.debug("Redis not connected, returning default velocity")
-            return {"velocity_1h": 0, "velocity_24h": 0, "amount_sum_24h": 0.0}
-
-        try:
-            now = int(time.time())
-
-            # Keys for sorted sets (score = timestamp)
-            key_1h = self._get_key(user_id, "1h")
-            key_24h = self._get_key(user_id, "24h")
-            key_amount = self._get_key(user_id, "amount_24h")
-
-            # Use pipeline for efficiency
-            pipe = self.redis_client.pipeline()
-
-            # Remove expired entries
-            pipe.zremrangebyscore(key_1h, 0, now - self.WINDOW_1H)
-            pipe.zremrangebyscore(key_24h, 0, now - self.WINDOW_24H)
-            pipe.zremrangebyscore(key_amount, 0, now - self.WINDOW_24H)
-
-            # Add current transaction
-            tx_id = f"{now}:{id(self)}"  # Unique transaction ID
-            pipe.zadd(key_1h, {tx_id: now})
-            pipe.zadd(key_24h, {tx_id: now})
-            pipe.zadd(key_amount, {f"{tx_id}:{amount}": now})
-
-            # Set TTL to auto-cleanup
-            pipe.expire(key_1h, self.WINDOW_1H + 60)
-            pipe.expire(key_24h, self.WINDOW_24H + 60)
-            pipe.expire(key_amount, self.WINDOW_24H + 60)
-
-            # Count transactions
-            pipe.zcard(key_1h)
-            pipe.zcard(key_24h)
-
-            # Execute pipeline
-            results = await pipe.execute()
-
-            # Get counts from results (last 2 items)
-            velocity_1h = results[-2]
-            velocity_24h = results[-1]
-
-            # Calculate amount sum (separate query for simplicity)
-            amount_entries = await self.redis_client.zrange(key_amount, 0, -1)
-            amount_sum_24h = sum(
-                float(entry.split(":")[-1])
-                for entry in amount_entries
-                if ":" in entry
-            )
-
-            logger.debug(f"User {user_id} velocity: 1h={velocity_1h}, 24h={velocity_24h}, sum={amount_sum_24h:.2f}")
-
-            return {
-                "velocity_1h": velocity_1h,
-                "velocity_24h": velocity_24h,
-                "amount_sum_24h": amount_sum_24h
-            }
-
-        except Exception as e:
-            logger.error(f"Error recording velocity: {e}")
-            return {"velocity_1h": 0, "velocity_24h": 0, "amount_sum_24h": 0.0}
-
-    async def get_velocity(self, user_id: str) -> Dict[str, int]:
-        """
-        Get current velocity for a user without recording.
-
-        Args:
-            user_id: User identifier
-
-        Returns:
-            Dict with velocity counts
-        """
-        if not self.connected or not self.redis_client:
-            return {"velocity_1h": 0, "velocity_24h": 0, "amount_sum_24h": 0.0}
-
-        try:
-            now = int(time.time())
-
-            key_1h = self._get_key(user_id, "1h")
-            key_24h = self._get_key(user_id, "24h")
-            key_amount = self._get_key(user_id, "amount_24h")
-
-            pipe = self.redis_client.pipeline()
-
-            # Clean expired and count
-            pipe.zremrangebyscore(key_1h, 0, now - self.WINDOW_1H)
-            pipe.zremrangebyscore(key_24h, 0, now - self.WINDOW_24H)
-            pipe.zcard(key_1h)
-            pipe.zcard(key_24h)
-
-            results = await pipe.execute()
-
-            velocity_1h = results[-2]
-            velocity_24h = results[-1]
-
-            # Get amount sum
-            amount_entries = await self.redis_client.zrange(key_amount, 0, -1)
-            amount_sum_24h = sum(
-                float(entry.split(":")[-1])
-                for entry in amount_entries
-                if ":" in entry
-            )
-
-            return {
-                "velocity_1h": velocity_1h,
-                "velocity_24h": velocity_24h,
-                "amount_sum_24h": amount_sum_24h
-            }
-
-        except Exception as e:
-            logger.error(f"Error getting velocity: {e}")
-            return {"velocity_1h": 0, "velocity_24h": 0, "amount_sum_24h": 0.0}
-
-
-# Global instance
-velocity_tracker = VelocityTracker()
+"""
+Velocity calculation module using Redis.
+Tracks transaction frequency per user for fraud detection.
+
+Counts and amounts are kept in time-bucketed INCR/INCRBYFLOAT counters
+that expire on their own, and windows are summed server-side by a Lua script.
+"""
+import functools
+import logging
+import time
+from typing import Optional, Dict, Any, List, Tuple
+import redis.asyncio as redis
+from redis.exceptions import NoScriptError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sums the window buckets server-side and returns {count_1h, count_24h, amount_24h}.
+# KEYS: minute count buckets, then hour count buckets, then hour amount buckets.
+# ARGV: number of minute buckets, number of hour buckets. The float sum is
+# returned as a string since Lua numbers are truncated to integers in replies.
+_WINDOW_SUM_LUA = """
+local n_minutes = tonumber(ARGV[1])
+local n_hours = tonumber(ARGV[2])
+local values = redis.call('MGET', unpack(KEYS))
+local count_1h, count_24h, amount_24h = 0, 0, 0
+for i = 1, n_minutes do
+    count_1h = count_1h + (tonumber(values[i]) or 0)
+end
+for i = n_minutes + 1, n_minutes + n_hours do
+    count_24h = count_24h + (tonumber(values[i]) or 0)
+end
+for i = n_minutes + n_hours + 1, #values do
+    amount_24h = amount_24h + (tonumber(values[i]) or 0)
+end
+return {count_1h, count_24h, tostring(amount_24h)}
+"""
+
+
+_KEY_PREFIX = "velocity:"
+
+
+@functools.lru_cache(maxsize=4)
+def _window_suffixes(minute: int, hour: int) -> Tuple[str, ...]:
+    """
+    User-independent key suffixes of every bucket in the 1h and 24h windows.
+
+    They only change once a minute, so they are built once and shared by
+    all users instead of formatting ~100 keys per transaction.
+    """
+    n_minutes = VelocityTracker.WINDOW_1H // VelocityTracker.BUCKET_1H
+    n_hours = VelocityTracker.WINDOW_24H // VelocityTracker.BUCKET_24H
+    hours = range(hour - n_hours + 1, hour + 1)
+    return tuple(
+        [f"count_1m:{m}" for m in range(minute - n_minutes + 1, minute + 1)]
+        + [f"count_1h:{h}" for h in hours]
+        + [f"amount_1h:{h}" for h in hours]
+    )
+
+
+class VelocityTracker:
+    """Tracks transaction velocity per user using Redis."""
+
+    # Time windows in seconds
+    WINDOW_1H = 3600      # 1 hour
+    WINDOW_24H = 86400    # 24 hours
+
+    # Counter bucket sizes in seconds (per-minute for 1h, per-hour for 24h)
+    BUCKET_1H = 60
+    BUCKET_24H = 3600
+
+    def __init__(self):
+        self.redis_client: Optional[redis.Redis] = None
+        self.connected = False
+        self._window_sum = None
+        self._window_args = (self.WINDOW_1H // self.BUCKET_1H, self.WINDOW_24H // self.BUCKET_24H)
+
+    async def initialize(self):
+        """Initialize Redis connection."""
+        try:
+            # Blocking pool: callers wait for a free socket rather than erroring
+            self.redis_client = redis.Redis.from_pool(redis.BlockingConnectionPool(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD,
+                decode_responses=True,
+                socket_connect_timeout=2.0,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT_S
+            ))
+            self._window_sum = self.redis_client.register_script(_WINDOW_SUM_LUA)
+            # Test connection
+            await self.redis_client.ping()
+            await self.redis_client.script_load(_WINDOW_SUM_LUA)
+            self.connected = True
+            logger.info(f"Velocity tracker connected to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
+        except Exception as e:
+            logger.warning(f"Failed to connect to Redis for velocity: {e}")
+            self.connected = False
+
+    async def close(self):
+        """Close Redis connection."""
+        if self.redis_client:
+            await self.redis_client.close()
+            logger.info("Velocity tracker Redis connection closed")
+
+    @staticmethod
+    def _get_key(user_id: str, window: str) -> str:
+        """Generate Redis key for user velocity."""
+        return f"{_KEY_PREFIX}{user_id}:{window}"
+
+    def _bucket_keys(self, user_id: str, now: int) -> Tuple[str, str, str]:
+        """Keys of the current minute count, hour count and hour amount buckets."""
+        minute = now // self.BUCKET_1H
+        hour = now // self.BUCKET_24H
+        return (
+            self._get_key(user_id, f"count_1m:{minute}"),
+            self._get_key(user_id, f"count_1h:{hour}"),
+            self._get_key(user_id, f"amount_1h:{hour}")
+        )
+
+    def _window_keys(self, user_id: str, now: int) -> List[str]:
+        """
+        Keys of every bucket in the 1h and 24h windows, in _WINDOW_SUM_LUA order.
+
+        The 1h window is made of per-minute buckets, the 24h window of
+        per-hour buckets (so it spans between 23 and 24 hours).
+        """
+        prefix = f"{_KEY_PREFIX}{user_id}:"
+        suffixes = _window_suffixes(now // self.BUCKET_1H, now // self.BUCKET_24H)
+        return [prefix + suffix for suffix in suffixes]
+
+    @staticmethod
+    def _to_velocity(sums: List[Any]) -> Dict[str, Any]:
+        """Map the window sum script reply to the velocity dict."""
+        return {
+            "velocity_1h": int(sums[0]),
+            "velocity_24h": int(sums[1]),
+            "amount_sum_24h": float(sums[2])
+        }
+
+    async def record_transaction(self, user_id: str, amount: float) -> Dict[str, int]:
+        """
+        Record a transaction and return current velocity counts.
+
+        Args:
+            user_id: User identifier
+            amount: Transaction amount
+
+        Returns:
+            Dict with velocity_1h and velocity_24h counts
+        """
+        if not self.connected or not self.redis_client:
+            logger.debug("Redis not connected, returning default velocity")
+            return {"velocity_1h": 0, "velocity_24h": 0, "amount_sum_24h": 0.0}
+
+        try:
+            now = int(time.time())
+            count_1m_key, count_1h_key, amount_1h_key = self._bucket_keys(user_id, now)
+
+            # Bump the current buckets and read both windows in one round trip.
+            # No MULTI/EXEC: commands still run in order on one connection and
+            # the counters need no isolation from other writers
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.incr(count_1m_key)
+            pipe.incr(count_1h_key)
+            pipe.incrbyfloat(amount_1h_key, amount)
+
+            # A bucket must outlive the window it can still be read in. The
+            # TTL is set by the bucket's first write only (NX, Redis >= 7):
+            # counted from then it already covers the whole window, and a
+            # no-op EXPIRE is not propagated to replicas or the AOF
+            pipe.expire(count_1m_key, self.WINDOW_1H + self.BUCKET_1H, nx=True)
+            pipe.expire(count_1h_key, self.WINDOW_24H + self.BUCKET_24H, nx=True)
+            pipe.expire(amount_1h_key, self.WINDOW_24H + self.BUCKET_24H, nx=True)
+
+            # Plain EVALSHA: queuing the Script object would make every
+            # execute() send SCRIPT EXISTS first (an extra round trip)
+            keys = self._window_keys(user_id, now)
+            pipe.evalsha(self._window_sum.sha, len(keys), *keys, *self._window_args)
+
+            results = await pipe.execute(raise_on_error=False)
+            sums = results[-1]
+            if isinstance(sums, NoScriptError):
+                # Script cache was flushed (e.g. Redis restart). The counters
+                # were already bumped, so only the read is retried
+                sums = await self._window_sum(keys=keys, args=self._window_args)
+            for result in results:
+                if isinstance(result, Exception) and not isinstance(result, NoScriptError):
+                    raise result
+            velocity = self._to_velocity(sums)
+
+            logger.debug(
+                "User %s velocity: 1h=%d, 24h=%d, sum=%.2f",
+                user_id, velocity["velocity_1h"], velocity["velocity_24h"], velocity["amount_sum_24h"]
+            )
+
+            return velocity
+
+        except Exception as e:
+            logger.error(f"Error recording velocity: {e}")
+            return {"velocity_1h": 0, "velocity_24h": 0, "amount_sum_24h": 0.0}
+
+    async def get_velocity(self, user_id: str) -> Dict[str, int]:
+        """
+        Get current velocity for a user without recording.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Dict with velocity counts
+        """
+        if not self.connected or not self.redis_client:
+            return {"velocity_1h": 0, "velocity_24h": 0, "amount_sum_24h": 0.0}
+
+        try:
+            now = int(time.time())
+            sums = await self._window_sum(
+                keys=self._window_keys(user_id, now), args=self._window_args
+            )
+            return self._to_velocity(sums)
+
+        except Exception as e:
+            logger.error(f"Error getting velocity: {e}")
+            return {"velocity_1h": 0, "velocity_24h": 0, "amount_sum_24h": 0.0}
+
+
+# Global instance
+velocity_tracker = VelocityTracker()
@@ -1,3 +1,3 @@
-"""SafeGuard Model Serving Service."""
-
-__version__ = "1.0.0"
+"""SafeGuard Model Serving Service."""
+
+__version__ = "1.0.0"
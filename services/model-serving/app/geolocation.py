@@ -1,345 +1,591 @@
-"""
-IP Geolocation module using ip-api.com (free, no API key required).
-Rate limit: 45 requests/minute - suitable for MVP.
-Includes Redis caching to avoid repeated lookups.
-Prometheus metrics for monitoring cache efficiency and geographic distribution.
-"""
-import json
-import logging
-import os
-import time
-import httpx
-import redis
-from typing import Optional
-from dataclasses import dataclass, asdict
-from prometheus_client import Counter, Histogram, Gauge
-
-logger = logging.getLogger(__name__)
-
-# =============================================================================
-# PROMETHEUS METRICS
-# =============================================================================
-
-# Cache metrics
-GEO_CACHE_HITS = Counter(
-    "geolocation_cache_hits_total",
-    "Total number of geolocation cache hits"
-)
-GEO_CACHE_MISSES = Counter(
-    "geolocation_cache_misses_total",
-    "Total number of geolocation cache misses"
-)
-
-# API call metrics
-GEO_API_CALLS = Counter(
-    "geolocation_api_calls_total",
-    "Total number of calls to ip-api.com",
-    ["status"]  # success, error, timeout
-)
-GEO_API_LATENCY = Histogram(
-    "geolocation_api_latency_seconds",
-    "Latency of ip-api.com API calls",
-    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0]
-)
-
-# Geographic distribution metrics
-GEO_COUNTRY_REQUESTS = Counter(
-    "geolocation_country_requests_total",
-    "Number of geolocated requests by country",
-    ["country"]
-)
-GEO_PRIVATE_IP_SKIPPED = Counter(
-    "geolocation_private_ip_skipped_total",
-    "Number of private/local IPs skipped"
-)
-
-# Cache size metric (updated periodically)
-GEO_CACHE_SIZE = Gauge(
-    "geolocation_cache_size",
-    "Current number of cached IP geolocations"
-)
-
-IP_API_URL = "http://ip-api.com/json/{ip}?fields=status,message,lat,lon,city,regionName,country,isp,org,as,query"
-
-# Redis cache settings (from environment or defaults)
-REDIS_HOST = os.getenv("REDIS_HOST", "redis")
-REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
-REDIS_DB = 1  # Use separate DB for geolocation cache
-CACHE_TTL_SECONDS = 86400  # 24 hours
-
-# Redis client (lazy initialization)
-_redis_client: Optional[redis.Redis] = None
-
-
-def get_redis_client() -> Optional[redis.Redis]:
-    """Get or create Redis client for caching."""
-    global _redis_client
-    if _redis_client is None:
-        try:
-            _redis_client = redis.Redis(
-                host=REDIS_HOST,
-                port=REDIS_PORT,
-                db=REDIS_DB,
-                decode_responses=True,
-                socket_timeout=1.0,
-                socket_connect_timeout=1.0
-            )
-            # Test connection
-            _redis_client.ping()
-            logger.info(f"Connected to Redis cache at {REDIS_HOST}:{REDIS_PORT}")
-        except Exception as e:
-            logger.warning(f"Redis cache not available: {e}")
-            _redis_client = None
-    return _redis_client
-
-
-def cache_key(ip: str) -> str:
-    """Generate cache key for IP address."""
-    return f"geo:ip:{ip}"
-
-
-@dataclass
-class GeoLocation:
-    """Geolocation data from IP lookup."""
-    ip: str
-    lat: float
-    lon: float
-    city: str
-    region: str
-    country: str
-    city_pop: int  # Estimated from city size
-    success: bool
-    error: Optional[str] = None
-
-
-# City population estimates (rough approximations for common cities)
-# In production, use a proper database like GeoNames
-CITY_POPULATION_ESTIMATES = {
-    # France
-    "paris": 2_161_000,
-    "marseille": 861_000,
-    "lyon": 513_000,
-    "toulouse": 471_000,
-    "nice": 342_000,
-    "nantes": 303_000,
-    "strasbourg": 277_000,
-    "montpellier": 277_000,
-    "bordeaux": 249_000,
-    "lille": 232_000,
-    # USA
-    "new york": 8_336_000,
-    "los angeles": 3_979_000,
-    "chicago": 2_693_000,
-    "houston": 2_320_000,
-    "phoenix": 1_680_000,
-    "san francisco": 873_000,
-    "seattle": 737_000,
-    "boston": 692_000,
-    "miami": 467_000,
-    # UK
-    "london": 8_982_000,
-    "birmingham": 1_141_000,
-    "manchester": 547_000,
-    # Germany
-    "berlin": 3_645_000,
-    "munich": 1_472_000,
-    "frankfurt": 753_000,
-    # Default for unknown cities
-    "default_large": 500_000,
-    "default_medium": 100_000,
-    "default_small": 20_000,
-}
-
-
-def estimate_city_population(city: str, country: str) -> int:
-    """
-    Estimate city population based on city name.
-    In production, use GeoNames database for accurate data.
-    """
-    if not city:
-        return CITY_POPULATION_ESTIMATES["default_medium"]
-
-    city_lower = city.lower()
-
-    # Direct lookup
-    if city_lower in CITY_POPULATION_ESTIMATES:
-        return CITY_POPULATION_ESTIMATES[city_lower]
-
-    # Capital cities tend to be larger
-    capitals = ["paris", "london", "berlin", "madrid", "rome", "washington", "tokyo", "beijing"]
-    if city_lower in capitals:
-        return CITY_POPULATION_ESTIMATES["default_large"]
-
-    # Default based on country development
-    developed_countries = ["US", "GB", "DE", "FR", "JP", "CA", "AU", "NL", "BE", "CH"]
-    if country in developed_countries:
-        return CITY_POPULATION_ESTIMATES["default_medium"]
-
-    return CITY_POPULATION_ESTIMATES["default_small"]
-
-
-def _geo_to_cache(geo: GeoLocation) -> str:
-    """Serialize GeoLocation to JSON for cache storage."""
-    return json.dumps(asdict(geo))
-
-
-def _geo_from_cache(data: str) -> GeoLocation:
-    """Deserialize GeoLocation from cache JSON."""
-    d = json.loads(data)
-    return GeoLocation(**d)
-
-
-async def geolocate_ip(ip: str, timeout: float = 2.0) -> GeoLocation:
-    """
-    Get geolocation data for an IP address using ip-api.com.
-    Results are cached in Redis for 24 hours.
-
-    Args:
-        ip: IP address to lookup
-        timeout: Request timeout in seconds
-
-    Returns:
-        GeoLocation object with coordinates and city info
-    """
-    # Skip private/local IPs
-    if ip.startswith(("10.", "172.16.", "172.17.", "172.18.", "172.19.",
-                      "172.20.", "172.21.", "172.22.", "172.23.", "172.24.",
-                      "172.25.", "172.26.", "172.27.", "172.28.", "172.29.",
-                      "172.30.", "172.31.", "192.168.", "127.", "0.")):
-        logger.debug(f"Skipping private IP: {ip}")
-        GEO_PRIVATE_IP_SKIPPED.inc()
-        return GeoLocation(
-            ip=ip,
-            lat=48.8566,  # Default to Paris
-            lon=2.3522,
-            city="Paris",
-            region="Île-de-France",
-            country="FR",
-            city_pop=2_161_000,
-            success=False,
-            error="Private IP address"
-        )
-
-    # Try to get from cache first
-    redis_client = get_redis_client()
-    if redis_client:
-        try:
-            cached = redis_client.get(cache_key(ip))
-            if cached:
-                geo = _geo_from_cache(cached)
-                logger.info(f"Cache HIT for IP {ip} -> {geo.city}")
-                GEO_CACHE_HITS.inc()
-                if geo.country:
-                    GEO_COUNTRY_REQUESTS.labels(country=geo.country).inc()
-                return geo
-            else:
-                GEO_CACHE_MISSES.inc()
-        except Exception as e:
-            logger.warning(f"Redis cache read error: {e}")
-            GEO_CACHE_MISSES.inc()
-
-    # Not in cache, fetch from API
-    start_time = time.time()
-    try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(IP_API_URL.format(ip=ip))
-            data = response.json()
-
-            # Record API latency
-            api_latency = time.time() - start_time
-            GEO_API_LATENCY.observe(api_latency)
-
-            if data.get("status") == "success":
-                city = data.get("city", "")
-                country = data.get("country", "")
-
-                geo = GeoLocation(
-                    ip=ip,
-                    lat=data.get("lat", 0.0),
-                    lon=data.get("lon", 0.0),
-                    city=city,
-                    region=data.get("regionName", ""),
-                    country=country,
-                    city_pop=estimate_city_population(city, country),
-                    success=True
-                )
-                logger.info(f"Geolocated {ip} -> {geo.city}, {geo.country} ({geo.lat}, {geo.lon})")
-
-                # Record metrics
-                GEO_API_CALLS.labels(status="success").inc()
-                if country:
-                    GEO_COUNTRY_REQUESTS.labels(country=country).inc()
-
-                # Store in cache
-                if redis_client:
-                    try:
-                        redis_client.setex(cache_key(ip), CACHE_TTL_SECONDS, _geo_to_cache(geo))
-                        logger.debug(f"Cached geolocation for {ip}")
-                        # Update cache size metric
-                        _update_cache_size(redis_client)
-                    except Exception as e:
-                        logger.warning(f"Redis cache write error: {e}")
-
-                return geo
-            else:
-                error_msg = data.get("message", "Unknown error")
-                logger.warning(f"IP geolocation failed for {ip}: {error_msg}")
-                GEO_API_CALLS.labels(status="error").inc()
-                return GeoLocation(
-                    ip=ip,
-                    lat=0.0,
-                    lon=0.0,
-                    city="",
-                    region="",
-                    country="",
-                    city_pop=CITY_POPULATION_ESTIMATES["default_medium"],
-                    success=False,
-                    error=error_msg
-                )
-
-    except httpx.TimeoutException:
-        logger.warning(f"IP geolocation timeout for {ip}")
-        GEO_API_CALLS.labels(status="timeout").inc()
-        GEO_API_LATENCY.observe(time.time() - start_time)
-        return GeoLocation(
-            ip=ip,
-            lat=0.0,
-            lon=0.0,
-            city="",
-            region="",
-            country="",
-            city_pop=CITY_POPULATION_ESTIMATES["default_medium"],
-            success=False,
-            error="Timeout"
-        )
-    except Exception as e:
-        logger.error(f"IP geolocation error for {ip}: {e}")
-        GEO_API_CALLS.labels(status="error").inc()
-        GEO_API_LATENCY.observe(time.time() - start_time)
-        return GeoLocation(
-            ip=ip,
-            lat=0.0,
-            lon=0.0,
-            city="",
-            region="",
-            country="",
-            city_pop=CITY_POPULATION_ESTIMATES["default_medium"],
-            success=False,
-            error=str(e)
-        )
-
-
-def _update_cache_size(redis_client: redis.Redis) -> None:
-    """Update the cache size gauge metric (called periodically)."""
-    try:
-        # Count keys matching geo:ip:* pattern
-        cursor = 0
-        count = 0
-        while True:
-            cursor, keys = redis_client.scan(cursor, match="geo:ip:*", count=100)
-            count += len(keys)
-            if cursor == 0:
-                break
-        GEO_CACHE_SIZE.set(count)
-    except Exception as e:
-        logger.debug(f"Could not update cache size metric: {e}")
+"""
+IP Geolocation module using ip-api.com (free, no API key required).
+Rate limit: 45 requests/minute - suitable for MVP.
+Includes Redis caching to avoid repeated lookups.
+Prometheus metrics for monitoring cache efficiency and geographic distribution.
+"""
+import asyncio
+import ipaddress
+import logging
+import os
+import random
+import time
+import httpx
+import orjson
+import redis.asyncio as redis
+from cachetools import TTLCache
+from functools import lru_cache
+from typing import Dict, List, Optional
+from dataclasses import dataclass, replace
+from prometheus_client import Counter, Histogram, Gauge
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+# Cache metrics
+GEO_CACHE_HITS = Counter(
+    "geolocation_cache_hits_total",
+    "Total number of geolocation cache hits"
+)
+GEO_CACHE_MISSES = Counter(
+    "geolocation_cache_misses_total",
+    "Total number of geolocation cache misses"
+)
+GEO_PREFIX_CACHE_HITS = Counter(
+    "geolocation_prefix_cache_hits_total",
+    "Total number of geolocations served from the in-process /24 cache"
+)
+
+# API call metrics
+GEO_API_CALLS = Counter(
+    "geolocation_api_calls_total",
+    "Total number of calls to ip-api.com",
+    ["status"]  # success, error, timeout
+)
+GEO_API_LATENCY = Histogram(
+    "geolocation_api_latency_seconds",
+    "Latency of ip-api.com API calls",
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0]
+)
+
+# Geographic distribution metrics
+GEO_COUNTRY_REQUESTS = Counter(
+    "geolocation_country_requests_total",
+    "Number of geolocated requests by country",
+    ["country"]
+)
+GEO_PRIVATE_IP_SKIPPED = Counter(
+    "geolocation_private_ip_skipped_total",
+    "Number of private/local IPs skipped"
+)
+
+# Cache size metric (updated periodically)
+GEO_CACHE_SIZE = Gauge(
+    "geolocation_cache_size",
+    "Current number of cached IP geolocations"
+)
+
+IP_API_URL = "http://ip-api.com/json/{ip}?fields=status,message,lat,lon,city,regionName,country,isp,org,as,query"
+# Up to 100 IPs per POST; rate limited separately (15 requests/minute)
+IP_API_BATCH_URL = "http://ip-api.com/batch?fields=status,message,lat,lon,city,regionName,country,isp,org,as,query"
+BATCH_MAX_SIZE = 100
+BATCH_WINDOW_SECONDS = 0.005  # Time to collect concurrent misses into one call
+
+# Redis cache settings (from environment or defaults)
+REDIS_HOST = os.getenv("REDIS_HOST", "redis")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_DB = 1  # Use separate DB for geolocation cache
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "128"))  # Pool socket cap
+REDIS_POOL_TIMEOUT_SECONDS = 0.5  # Wait for a free pooled socket before erroring
+CACHE_TTL_SECONDS = 86400  # 24 hours
+CACHE_TTL_JITTER_SECONDS = 3600  # +/- 1 hour spread on successful entries
+NEGATIVE_CACHE_TTL_SECONDS = 300  # Failed lookups (API error, timeout)
+CACHE_SIZE_REFRESH_SECONDS = 60  # Cache size gauge refresh period
+PREFIX_CACHE_SIZE = 65536  # In-process cache of successful lookups per /24 (IPv6: /48)
+PREFIX_CACHE_TTL_SECONDS = 3600
+
+# Redis client (lazy initialization)
+_redis_client: Optional[redis.Redis] = None
+
+# HTTP client for ip-api.com (lazy initialization, reused for keep-alive)
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Background task refreshing GEO_CACHE_SIZE
+_cache_size_task: Optional[asyncio.Task] = None
+
+# Successful lookups keyed by network prefix, checked before Redis
+_prefix_cache: "TTLCache[bytes, GeoLocation]" = TTLCache(maxsize=PREFIX_CACHE_SIZE, ttl=PREFIX_CACHE_TTL_SECONDS)
+
+# In-flight ip-api.com lookups keyed by IP
+_inflight: Dict[str, "asyncio.Future[GeoLocation]"] = {}
+
+# Misses waiting for the next (batched) ip-api.com call, and its flush task
+_batch_pending: Dict[str, "asyncio.Future[GeoLocation]"] = {}
+_batch_flush_task: Optional[asyncio.Task] = None
+
+
+async def get_redis_client() -> Optional[redis.Redis]:
+    """Get or create Redis client for caching."""
+    global _redis_client
+    if _redis_client is None:
+        # Blocking pool: callers wait for a free socket rather than erroring
+        client = redis.Redis.from_pool(redis.BlockingConnectionPool(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            # Cache values are orjson bytes, decoded by _geo_from_cache
+            decode_responses=False,
+            socket_timeout=1.0,
+            socket_connect_timeout=1.0,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT_SECONDS
+        ))
+        try:
+            # Test connection
+            await client.ping()
+        except Exception as e:
+            logger.warning(f"Redis cache not available: {e}")
+            await client.close()
+            return None
+        if _redis_client is None:
+            _redis_client = client
+            logger.info(f"Connected to Redis cache at {REDIS_HOST}:{REDIS_PORT}")
+        else:
+            # Another request connected while we were pinging
+            await client.close()
+    return _redis_client
+
+
+async def close_redis_client() -> None:
+    """Close the Redis cache client (service shutdown)."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.close()
+        _redis_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared HTTP client for ip-api.com."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(2.0),
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (service shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def cache_key(ip: str) -> str:
+    """Generate cache key for IP address."""
+    return f"geo:ip:{ip}"
+
+
+@dataclass
+class GeoLocation:
+    """Geolocation data from IP lookup."""
+    ip: str
+    lat: float
+    lon: float
+    city: str
+    region: str
+    country: str
+    city_pop: int  # Estimated from city size
+    success: bool
+    error: Optional[str] = None
+
+
+# City population estimates (rough approximations for common cities)
+# In production, use a proper database like GeoNames
+CITY_POPULATION_ESTIMATES = {
+    # France
+    "paris": 2_161_000,
+    "marseille": 861_000,
+    "lyon": 513_000,
+    "toulouse": 471_000,
+    "nice": 342_000,
+    "nantes": 303_000,
+    "strasbourg": 277_000,
+    "montpellier": 277_000,
+    "bordeaux": 249_000,
+    "lille": 232_000,
+    # USA
+    "new york": 8_336_000,
+    "los angeles": 3_979_000,
+    "chicago": 2_693_000,
+    "houston": 2_320_000,
+    "phoenix": 1_680_000,
+    "san francisco": 873_000,
+    "seattle": 737_000,
+    "boston": 692_000,
+    "miami": 467_000,
+    # UK
+    "london": 8_982_000,
+    "birmingham": 1_141_000,
+    "manchester": 547_000,
+    # Germany
+    "berlin": 3_645_000,
+    "munich": 1_472_000,
+    "frankfurt": 753_000,
+    # Default for unknown cities
+    "default_large": 500_000,
+    "default_medium": 100_000,
+    "default_small": 20_000,
+}
+
+
+# Capital cities tend to be larger
+_CAPITALS = frozenset(("paris", "london", "berlin", "madrid", "rome", "washington", "tokyo", "beijing"))
+_DEVELOPED_COUNTRIES = frozenset(("US", "GB", "DE", "FR", "JP", "CA", "AU", "NL", "BE", "CH"))
+
+
+@lru_cache(maxsize=4096)
+def estimate_city_population(city: str, country: str) -> int:
+    """
+    Estimate city population based on city name.
+    In production, use GeoNames database for accurate data.
+
+    Memoized: the same few thousand (city, country) pairs recur on every miss.
+    """
+    if not city:
+        return CITY_POPULATION_ESTIMATES["default_medium"]
+
+    city_lower = city.lower()
+
+    # Direct lookup
+    if city_lower in CITY_POPULATION_ESTIMATES:
+        return CITY_POPULATION_ESTIMATES[city_lower]
+
+    if city_lower in _CAPITALS:
+        return CITY_POPULATION_ESTIMATES["default_large"]
+
+    # Default based on country development
+    if country in _DEVELOPED_COUNTRIES:
+        return CITY_POPULATION_ESTIMATES["default_medium"]
+
+    return CITY_POPULATION_ESTIMATES["default_small"]
+
+
+def _geo_to_cache(geo: GeoLocation) -> bytes:
+    """Serialize GeoLocation to JSON for cache storage (orjson encodes dataclasses natively)."""
+    return orjson.dumps(geo)
+
+
+def _geo_from_cache(data: bytes) -> GeoLocation:
+    """Deserialize GeoLocation from cache JSON."""
+    return GeoLocation(**orjson.loads(data))
+
+
+async def geolocate_ip(ip: str, timeout: float = 2.0) -> GeoLocation:
+    """
+    Get geolocation data for an IP address using ip-api.com.
+    Results are cached in Redis for about 24 hours (failures for 5 minutes),
+    and successful ones in-process for an hour per /24 network (IPv6: /48),
+    which ip-api.com rarely resolves more finely.
+
+    Args:
+        ip: IP address to lookup
+        timeout: Request timeout in seconds
+
+    Returns:
+        GeoLocation object with coordinates and city info
+    """
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        # Not worth an API call (and a slot of the rate limit)
+        logger.warning(f"Invalid IP address: {ip}")
+        GEO_API_CALLS.labels(status="error").inc()
+        return GeoLocation(
+            ip=ip,
+            lat=0.0,
+            lon=0.0,
+            city="",
+            region="",
+            country="",
+            city_pop=CITY_POPULATION_ESTIMATES["default_medium"],
+            success=False,
+            error="Invalid IP address"
+        )
+
+    # Skip private/local IPs (RFC 1918, loopback, link-local, IPv6 ULA, ...)
+    if addr.is_private or addr.is_loopback or addr.is_unspecified:
+        logger.debug("Skipping private IP: %s", ip)
+        GEO_PRIVATE_IP_SKIPPED.inc()
+        return GeoLocation(
+            ip=ip,
+            lat=48.8566,  # Default to Paris
+            lon=2.3522,
+            city="Paris",
+            region="Île-de-France",
+            country="FR",
+            city_pop=2_161_000,
+            success=False,
+            error="Private IP address"
+        )
+
+    # Neighbouring IPs share a location: in-process cache per network prefix
+    prefix = addr.packed[:3] if addr.version == 4 else addr.packed[:6]
+    geo = _prefix_cache.get(prefix)
+    if geo is not None:
+        GEO_PREFIX_CACHE_HITS.inc()
+        if geo.country:
+            GEO_COUNTRY_REQUESTS.labels(country=geo.country).inc()
+        return geo if geo.ip == ip else replace(geo, ip=ip)
+
+    # Then Redis
+    redis_client = await get_redis_client()
+    if redis_client:
+        try:
+            cached = await redis_client.get(cache_key(ip))
+            if cached:
+                geo = _geo_from_cache(cached)
+                logger.debug("Cache HIT for IP %s -> %s", ip, geo.city)
+                GEO_CACHE_HITS.inc()
+                if geo.country:
+                    GEO_COUNTRY_REQUESTS.labels(country=geo.country).inc()
+                if geo.success:
+                    _prefix_cache[prefix] = geo
+                return geo
+            else:
+                GEO_CACHE_MISSES.inc()
+        except Exception as e:
+            logger.warning(f"Redis cache read error: {e}")
+            GEO_CACHE_MISSES.inc()
+
+    # Not in cache: one API call per IP, shared by concurrent requests
+    # (singleflight) so a cold IP cannot burn several slots of the rate limit
+    task = _inflight.get(ip)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_geolocation(ip, timeout, redis_client))
+        _inflight[ip] = task
+        task.add_done_callback(lambda t: _inflight.pop(ip, None))
+    else:
+        logger.debug("Coalescing geolocation lookup for %s with in-flight request", ip)
+
+    # Shield so a cancelled caller does not cancel the shared lookup
+    geo = await asyncio.shield(task)
+    if geo.success:
+        _prefix_cache[prefix] = geo
+    return geo
+
+
+async def geolocate_ips(ips: List[str], timeout: float = 2.0) -> List[GeoLocation]:
+    """
+    Geolocate several IPs at once (results in input order).
+
+    Cache misses are sent to ip-api.com together in a single /batch call.
+    """
+    return list(await asyncio.gather(*[geolocate_ip(ip, timeout) for ip in ips]))
+
+
+async def _fetch_geolocation(ip: str, timeout: float, redis_client: Optional[redis.Redis]) -> GeoLocation:
+    """Call ip-api.com for one IP and cache the result (failures only briefly)."""
+    geo = await _lookup_ip_api(ip, timeout)
+
+    if redis_client:
+        if geo.success:
+            # Jittered so entries cached together do not all expire together
+            ttl = CACHE_TTL_SECONDS + random.randint(-CACHE_TTL_JITTER_SECONDS, CACHE_TTL_JITTER_SECONDS)
+        else:
+            # Negative caching: spare the rate limit while an IP keeps failing
+            ttl = NEGATIVE_CACHE_TTL_SECONDS
+        try:
+            await redis_client.setex(cache_key(ip), ttl, _geo_to_cache(geo))
+            logger.debug("Cached geolocation for %s (ttl=%ss)", ip, ttl)
+        except Exception as e:
+            logger.warning(f"Redis cache write error: {e}")
+
+    return geo
+
+
+async def _lookup_ip_api(ip: str, timeout: float) -> GeoLocation:
+    """
+    Queue one IP for the next ip-api.com call.
+
+    Misses arriving within BATCH_WINDOW_SECONDS of each other are sent
+    together to the /batch endpoint (one HTTP round trip for up to
+    BATCH_MAX_SIZE IPs). Callers are already deduplicated per IP.
+    """
+    global _batch_flush_task
+    future = asyncio.get_running_loop().create_future()
+    _batch_pending[ip] = future
+    if _batch_flush_task is None:
+        _batch_flush_task = asyncio.ensure_future(_flush_batch(timeout))
+        _batch_flush_task.add_done_callback(_on_flush_done)
+    return await future
+
+
+async def _flush_batch(timeout: float) -> None:
+    """Wait for the batching window, then resolve every pending lookup."""
+    pending: Dict[str, "asyncio.Future[GeoLocation]"] = {}
+    results: Dict[str, GeoLocation] = {}
+    try:
+        await asyncio.sleep(BATCH_WINDOW_SECONDS)
+        pending = _take_batch()
+
+        ips = list(pending)
+        if len(ips) == 1:
+            # /batch has its own, smaller quota: a lone IP uses the single endpoint
+            chunks = [await _call_ip_api(ips[0], timeout)]
+        else:
+            chunks = await asyncio.gather(*[
+                _call_ip_api_batch(ips[k:k + BATCH_MAX_SIZE], timeout)
+                for k in range(0, len(ips), BATCH_MAX_SIZE)
+            ])
+        for chunk in chunks:
+            if isinstance(chunk, GeoLocation):
+                results[chunk.ip] = chunk
+            else:
+                results.update(chunk)
+
+    finally:
+        if not pending:
+            # Cancelled during the window, before the batch was taken
+            pending = _take_batch()
+        # Always settle every waiter, even on errors or cancellation
+        for ip, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(ip) or _failed_geo(ip, "Missing from batch reply"))
+
+
+def _on_flush_done(task: asyncio.Task) -> None:
+    """Settle the batch of a flush task cancelled before it started running."""
+    if task is _batch_flush_task:
+        for ip, future in _take_batch().items():
+            if not future.done():
+                future.set_result(_failed_geo(ip, "Missing from batch reply"))
+
+
+def _take_batch() -> Dict[str, "asyncio.Future[GeoLocation]"]:
+    """Detach the pending lookups so new misses start the next batch."""
+    global _batch_flush_task
+    pending = dict(_batch_pending)
+    _batch_pending.clear()
+    _batch_flush_task = None
+    return pending
+
+
+def _geo_from_api(ip: str, data: Dict) -> GeoLocation:
+    """Build a GeoLocation from one ip-api.com result object."""
+    if data.get("status") == "success":
+        city = data.get("city", "")
+        country = data.get("country", "")
+
+        geo = GeoLocation(
+            ip=ip,
+            lat=data.get("lat", 0.0),
+            lon=data.get("lon", 0.0),
+            city=city,
+            region=data.get("regionName", ""),
+            country=country,
+            city_pop=estimate_city_population(city, country),
+            success=True
+        )
+        logger.debug("Geolocated %s -> %s, %s (%s, %s)", ip, geo.city, geo.country, geo.lat, geo.lon)
+
+        # Record metrics
+        GEO_API_CALLS.labels(status="success").inc()
+        if country:
+            GEO_COUNTRY_REQUESTS.labels(country=country).inc()
+
+        return geo
+
+    error_msg = data.get("message", "Unknown error")
+    logger.warning(f"IP geolocation failed for {ip}: {error_msg}")
+    GEO_API_CALLS.labels(status="error").inc()
+    return _failed_geo(ip, error_msg)
+
+
+def _failed_geo(ip: str, error: str) -> GeoLocation:
+    """GeoLocation returned when an IP could not be geolocated."""
+    return GeoLocation(
+        ip=ip,
+        lat=0.0,
+        lon=0.0,
+        city="",
+        region="",
+        country="",
+        city_pop=CITY_POPULATION_ESTIMATES["default_medium"],
+        success=False,
+        error=error
+    )
+
+
+async def _call_ip_api(ip: str, timeout: float) -> GeoLocation:
+    """Call ip-api.com for one IP."""
+    start_time = time.perf_counter()
+    try:
+        response = await get_http_client().get(IP_API_URL.format(ip=ip), timeout=timeout)
+        data = response.json()
+
+        # Record API latency
+        GEO_API_LATENCY.observe(time.perf_counter() - start_time)
+        return _geo_from_api(ip, data)
+
+    except httpx.TimeoutException:
+        logger.warning(f"IP geolocation timeout for {ip}")
+        GEO_API_CALLS.labels(status="timeout").inc()
+        GEO_API_LATENCY.observe(time.perf_counter() - start_time)
+        return _failed_geo(ip, "Timeout")
+    except Exception as e:
+        logger.error(f"IP geolocation error for {ip}: {e}")
+        GEO_API_CALLS.labels(status="error").inc()
+        GEO_API_LATENCY.observe(time.perf_counter() - start_time)
+        return _failed_geo(ip, str(e))
+
+
+async def _call_ip_api_batch(ips: List[str], timeout: float) -> Dict[str, GeoLocation]:
+    """Call the ip-api.com /batch endpoint for up to BATCH_MAX_SIZE IPs."""
+    start_time = time.perf_counter()
+    try:
+        response = await get_http_client().post(
+            IP_API_BATCH_URL, json=[{"query": ip} for ip in ips], timeout=timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+        # Results come back in request order, one per query
+        if not isinstance(data, list) or len(data) != len(ips):
+            raise ValueError(f"Expected {len(ips)} results in batch reply")
+
+        # Record API latency
+        GEO_API_LATENCY.observe(time.perf_counter() - start_time)
+        return {ip: _geo_from_api(ip, item) for ip, item in zip(ips, data)}
+
+    except httpx.TimeoutException:
+        logger.warning(f"IP geolocation batch timeout for {len(ips)} IPs")
+        GEO_API_CALLS.labels(status="timeout").inc(len(ips))
+        GEO_API_LATENCY.observe(time.perf_counter() - start_time)
+        return {ip: _failed_geo(ip, "Timeout") for ip in ips}
+    except Exception as e:
+        logger.error(f"IP geolocation batch error for {len(ips)} IPs: {e}")
+        GEO_API_CALLS.labels(status="error").inc(len(ips))
+        GEO_API_LATENCY.observe(time.perf_counter() - start_time)
+        return {ip: _failed_geo(ip, str(e)) for ip in ips}
+
+
+async def _update_cache_size(redis_client: redis.Redis) -> None:
+    """Update the cache size gauge metric (called periodically)."""
+    try:
+        # REDIS_DB holds only geolocation keys, so DBSIZE (O(1)) is the cache size
+        GEO_CACHE_SIZE.set(await redis_client.dbsize())
+    except Exception as e:
+        logger.debug(f"Could not update cache size metric: {e}")
+
+
+async def _cache_size_loop() -> None:
+    """Refresh the cache size gauge every CACHE_SIZE_REFRESH_SECONDS."""
+    while True:
+        redis_client = await get_redis_client()
+        if redis_client:
+            await _update_cache_size(redis_client)
+        await asyncio.sleep(CACHE_SIZE_REFRESH_SECONDS)
+
+
+def start_cache_size_updater() -> None:
+    """Start the background cache size refresh (service startup)."""
+    global _cache_size_task
+    if _cache_size_task is None:
+        _cache_size_task = asyncio.create_task(_cache_size_loop())
+
+
+async def stop_cache_size_updater() -> None:
+    """Stop the background cache size refresh (service shutdown)."""
+    global _cache_size_task
+    if _cache_size_task is not None:
+        _cache_size_task.cancel()
+        try:
+            await _cache_size_task
+        except asyncio.CancelledError:
+            pass
+        _cache_size_task = None
@@ -1,4 +1,4 @@
-"""
-SafeGuard AI - Rules Service
-"""
-__version__ = "1.0.0"
+"""
+SafeGuard AI - Rules Service
+"""
+__version__ = "1.0.0"
@@ -1,239 +1,335 @@
-"""
-Deny/Allow Lists Checker using Redis cache.
-"""
-import logging
-from typing import Dict, List, Optional, Set
-import redis.asyncio as redis
-from datetime import datetime
-
-logger = logging.getLogger(__name__)
-
-
-class ListsChecker:
-    """
-    Checks transaction context against deny/allow lists stored in Redis.
-    
-    Redis key structure:
-    - deny_list:user_id - Set of denied user IDs
-    - deny_list:ip_address - Set of denied IP addresses
-    - deny_list:device_id - Set of denied device IDs
-    - deny_list:merchant_id - Set of denied merchant IDs
-    - allow_list:user_id - Set of allowed/whitelisted user IDs
-    - allow_list:ip_address - Set of allowed IP addresses
-    """
-    
-    def __init__(self, redis_client: redis.Redis):
-        self.redis = redis_client
-        
-        # Fields to check against lists
-        self.check_fields = [
-            'user_id',
-            'ip_address',
-            'device_id',
-            'merchant_id',
-            'geo'
-        ]
-    
-    async def check_deny_lists(self, context: Dict) -> List[Dict]:
-        """
-        Check if any context fields are in deny lists.
-        
-        Args:
-            context: Transaction context dictionary
-            
-        Returns:
-            List of deny list matches
-        """
-        matches = []
-        
-        try:
-            for field in self.check_fields:
-                value = context.get(field)
-                if not value:
-                    continue
-                
-                key = f"deny_list:{field}"
-                
-                # Check if value is in deny list
-                is_denied = await self.redis.sismember(key, str(value))
-                
-                if is_denied:
-                    matches.append({
-                        'list_type': 'deny',
-                        'list_name': key,
-                        'matched_value': str(value),
-                        'field': field,
-                        'reason': f"{field} '{value}' is on deny list"
-                    })
-                    logger.info(f"Deny list match: {field}={value}")
-        
-        except Exception as e:
-            logger.error(f"Error checking deny lists: {e}")
-        
-        return matches
-    
-    async def check_allow_lists(self, context: Dict) -> List[Dict]:
-        """
-        Check if any context fields are in allow lists.
-        
-        Args:
-            context: Transaction context dictionary
-            
-        Returns:
-            List of allow list matches
-        """
-        matches = []
-        
-        try:
-            for field in self.check_fields:
-                value = context.get(field)
-                if not value:
-                    continue
-                
-                key = f"allow_list:{field}"
-                
-                # Check if value is in allow list
-                is_allowed = await self.redis.sismember(key, str(value))
-                
-                if is_allowed:
-                    matches.append({
-                        'list_type': 'allow',
-                        'list_name': key,
-                        'matched_value': str(value),
-                        'field': field,
-                        'reason': f"{field} '{value}' is on allow list"
-                    })
-                    logger.info(f"Allow list match: {field}={value}")
-        
-        except Exception as e:
-            logger.error(f"Error checking allow lists: {e}")
-        
-        return matches
-    
-    async def check_all_lists(self, context: Dict) -> tuple[List[Dict], List[Dict]]:
-        """
-        Check both deny and allow lists.
-        
-        Args:
-            context: Transaction context dictionary
-            
-        Returns:
-            (deny_matches, allow_matches)
-        """
-        deny_matches = await self.check_deny_lists(context)
-        allow_matches = await self.check_allow_lists(context)
-        
-        return deny_matches, allow_matches
-    
-    async def add_to_deny_list(self, field: str, value: str, ttl: Optional[int] = None) -> bool:
-        """
-        Add a value to a deny list.
-        
-        Args:
-            field: Field name (e.g., 'user_id', 'ip_address')
-            value: Value to deny
-            ttl: Optional TTL in seconds
-            
-        Returns:
-            True if added successfully
-        """
-        try:
-            key = f"deny_list:{field}"
-            await self.redis.sadd(key, str(value))
-            
-            if ttl:
-                await self.redis.expire(key, ttl)
-            
-            logger.info(f"Added {value} to {key}")
-            return True
-        
-        except Exception as e:
-            logger.error(f"Error adding to deny list: {e}")
-            return False
-    
-    async def add_to_allow_list(self, field: str, value: str, ttl: Optional[int] = None) -> bool:
-        """
-        Add a value to an allow list.
-        
-        Args:
-            field: Field name (e.g., 'user_id', 'ip_address')
-            value: Value to allow
-            ttl: Optional TTL in seconds
-            
-        Returns:
-            True if added successfully
-        """
-        try:
-            key = f"allow_list:{field}"
-            await self.redis.sadd(key, str(value))
-            
-            if ttl:
-                await self.redis.expire(key, ttl)
-            
-            logger.info(f"Added {value} to {key}")
-            return True
-        
-        except Exception as e:
-            logger.error(f"Error adding to allow list: {e}")
-            return False
-    
-    async def remove_from_deny_list(self, field: str, value: str) -> bool:
-        """Remove a value from a deny list."""
-        try:
-            key = f"deny_list:{field}"
-            await self.redis.srem(key, str(value))
-            logger.info(f"Removed {value} from {key}")
-            return True
-        except Exception as e:
-            logger.error(f"Error removing from deny list: {e}")
-            return False
-    
-    async def remove_from_allow_list(self, field: str, value: str) -> bool:
-        """Remove a value from an allow list."""
-        try:
-            key = f"allow_list:{field}"
-            await self.redis.srem(key, str(value))
-            logger.info(f"Removed {value} from {key}")
-            return True
-        except Exception as e:
-            logger.error(f"Error removing from allow list: {e}")
-            return False
-    
-    async def get_list_members(self, list_type: str, field: str) -> Set[str]:
-        """
-        Get all members of a list.
-        
-        Args:
-            list_type: 'deny' or 'allow'
-            field: Field name
-            
-        Returns:
-            Set of values in the list
-        """
-        try:
-            key = f"{list_type}_list:{field}"
-            members = await self.redis.smembers(key)
-            return {m.decode() if isinstance(m, bytes) else m for m in members}
-        except Exception as e:
-            logger.error(f"Error getting list members: {e}")
-            return set()
-    
-    async def clear_list(self, list_type: str, field: str) -> bool:
-        """Clear all entries from a list."""
-        try:
-            key = f"{list_type}_list:{field}"
-            await self.redis.delete(key)
-            logger.info(f"Cleared {key}")
-            return True
-        except Exception as e:
-            logger.error(f"Error clearing list: {e}")
-            return False
-    
-    async def health_check(self) -> bool:
-        """Check if Redis connection is healthy."""
-        try:
-            await self.redis.ping()
-            return True
-        except Exception as e:
-            logger.error(f"Redis health check failed: {e}")
-            return False
+"""
+Deny/Allow Lists Checker using Redis cache.
+"""
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+import redis.asyncio as redis
+from cachetools import TTLCache
+from datetime import datetime
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Pub/sub channel used to drop cached lookups on every worker after a list change
+INVALIDATION_CHANNEL = "lists:invalidate"
+
+
+class ListsChecker:
+    """
+    Checks transaction context against deny/allow lists stored in Redis.
+    
+    Redis key structure:
+    - deny_list:user_id - Set of denied user IDs
+    - deny_list:ip_address - Set of denied IP addresses
+    - deny_list:device_id - Set of denied device IDs
+    - deny_list:merchant_id - Set of denied merchant IDs
+    - allow_list:user_id - Set of allowed/whitelisted user IDs
+    - allow_list:ip_address - Set of allowed IP addresses
+    
+    Lookup results (hits and misses) are kept in an in-process TTL cache
+    keyed by (list_type, field, value). Changes made through this class
+    invalidate the cache locally and on other workers via pub/sub; changes
+    made directly in Redis (or key expiry) show up after LISTS_CACHE_TTL.
+    """
+    
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        cache_size: int = config.LISTS_CACHE_SIZE,
+        cache_ttl: int = config.LISTS_CACHE_TTL
+    ):
+        self.redis = redis_client
+        self._cache: TTLCache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # Bumped on every invalidation so in-flight lookups don't cache stale results
+        self._generation = 0
+        
+        # Fields to check against lists
+        self.check_fields = [
+            'user_id',
+            'ip_address',
+            'device_id',
+            'merchant_id',
+            'geo'
+        ]
+    
+    async def check_deny_lists(self, context: Dict) -> List[Dict]:
+        """
+        Check if any context fields are in deny lists.
+        
+        Args:
+            context: Transaction context dictionary
+            
+        Returns:
+            List of deny list matches
+        """
+        matches = await self._check_lists(context, ('deny',))
+        return matches['deny']
+    
+    async def check_allow_lists(self, context: Dict) -> List[Dict]:
+        """
+        Check if any context fields are in allow lists.
+        
+        Args:
+            context: Transaction context dictionary
+            
+        Returns:
+            List of allow list matches
+        """
+        matches = await self._check_lists(context, ('allow',))
+        return matches['allow']
+    
+    async def check_all_lists(self, context: Dict) -> tuple[List[Dict], List[Dict]]:
+        """
+        Check both deny and allow lists (one Redis round trip).
+        
+        Args:
+            context: Transaction context dictionary
+            
+        Returns:
+            (deny_matches, allow_matches)
+        """
+        matches = await self._check_lists(context, ('deny', 'allow'))
+        return matches['deny'], matches['allow']
+    
+    async def _check_lists(self, context: Dict, list_types: Tuple[str, ...]) -> Dict[str, List[Dict]]:
+        """
+        Look up every context field in the given list types.
+        
+        Cached lookups are answered locally; the remaining SISMEMBER calls
+        are pipelined, so the check costs at most one round trip whatever
+        the number of fields and lists.
+        
+        Args:
+            context: Transaction context dictionary
+            list_types: 'deny' and/or 'allow'
+            
+        Returns:
+            Matches per list type
+        """
+        matches: Dict[str, List[Dict]] = {list_type: [] for list_type in list_types}
+        
+        lookups = []
+        for list_type in list_types:
+            for field in self.check_fields:
+                value = context.get(field)
+                if value:
+                    lookups.append((list_type, field, str(value)))
+        if not lookups:
+            return matches
+        
+        found_by_lookup = {}
+        misses = []
+        for lookup in lookups:
+            found = self._cache.get(lookup)
+            if found is None:
+                misses.append(lookup)
+            else:
+                found_by_lookup[lookup] = found
+        
+        if misses:
+            generation = self._generation
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for list_type, field, value in misses:
+                    pipe.sismember(f"{list_type}_list:{field}", value)
+                results = await pipe.execute()
+            
+            except Exception as e:
+                logger.error(f"Error checking {'/'.join(list_types)} lists: {e}")
+                return matches
+            
+            for lookup, found in zip(misses, results):
+                found = bool(found)
+                found_by_lookup[lookup] = found
+                if generation == self._generation:
+                    self._cache[lookup] = found
+        
+        for list_type, field, value in lookups:
+            found = found_by_lookup[(list_type, field, value)]
+            if found:
+                matches[list_type].append({
+                    'list_type': list_type,
+                    'list_name': f"{list_type}_list:{field}",
+                    'matched_value': value,
+                    'field': field,
+                    'reason': f"{field} '{value}' is on {list_type} list"
+                })
+                logger.info(f"{list_type.capitalize()} list match: {field}={value}")
+        
+        return matches
+    
+    async def add_to_deny_list(self, field: str, value: str, ttl: Optional[int] = None) -> bool:
+        """
+        Add a value to a deny list.
+        
+        Args:
+            field: Field name (e.g., 'user_id', 'ip_address')
+            value: Value to deny
+            ttl: Optional TTL in seconds
+            
+        Returns:
+            True if added successfully
+        """
+        try:
+            key = f"deny_list:{field}"
+            await self.redis.sadd(key, str(value))
+            
+            if ttl:
+                await self.redis.expire(key, ttl)
+            
+            await self._invalidate('deny', field, value)
+            logger.info(f"Added {value} to {key}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error adding to deny list: {e}")
+            return False
+    
+    async def add_to_allow_list(self, field: str, value: str, ttl: Optional[int] = None) -> bool:
+        """
+        Add a value to an allow list.
+        
+        Args:
+            field: Field name (e.g., 'user_id', 'ip_address')
+            value: Value to allow
+            ttl: Optional TTL in seconds
+            
+        Returns:
+            True if added successfully
+        """
+        try:
+            key = f"allow_list:{field}"
+            await self.redis.sadd(key, str(value))
+            
+            if ttl:
+                await self.redis.expire(key, ttl)
+            
+            await self._invalidate('allow', field, value)
+            logger.info(f"Added {value} to {key}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error adding to allow list: {e}")
+            return False
+    
+    async def remove_from_deny_list(self, field: str, value: str) -> bool:
+        """Remove a value from a deny list."""
+        try:
+            key = f"deny_list:{field}"
+            await self.redis.srem(key, str(value))
+            await self._invalidate('deny', field, value)
+            logger.info(f"Removed {value} from {key}")
+            return True
+        except Exception as e:
+            logger.error(f"Error removing from deny list: {e}")
+            return False
+    
+    async def remove_from_allow_list(self, field: str, value: str) -> bool:
+        """Remove a value from an allow list."""
+        try:
+            key = f"allow_list:{field}"
+            await self.redis.srem(key, str(value))
+            await self._invalidate('allow', field, value)
+            logger.info(f"Removed {value} from {key}")
+            return True
+        except Exception as e:
+            logger.error(f"Error removing from allow list: {e}")
+            return False
+    
+    async def get_list_members(self, list_type: str, field: str) -> Set[str]:
+        """
+        Get all members of a list.
+        
+        Args:
+            list_type: 'deny' or 'allow'
+            field: Field name
+            
+        Returns:
+            Set of values in the list
+        """
+        try:
+            key = f"{list_type}_list:{field}"
+            members = await self.redis.smembers(key)
+            return {m.decode() if isinstance(m, bytes) else m for m in members}
+        except Exception as e:
+            logger.error(f"Error getting list members: {e}")
+            return set()
+    
+    async def clear_list(self, list_type: str, field: str) -> bool:
+        """Clear all entries from a list."""
+        try:
+            key = f"{list_type}_list:{field}"
+            await self.redis.delete(key)
+            await self._invalidate(list_type, field)
+            logger.info(f"Cleared {key}")
+            return True
+        except Exception as e:
+            logger.error(f"Error clearing list: {e}")
+            return False
+    
+    def _drop_cached(self, list_type: str, field: str, value: Optional[str] = None) -> None:
+        """Drop one cached lookup, or every lookup of a list when value is None."""
+        self._generation += 1
+        if value is not None:
+            self._cache.pop((list_type, field, str(value)), None)
+            return
+        for key in [k for k in list(self._cache.keys()) if k[0] == list_type and k[1] == field]:
+            self._cache.pop(key, None)
+    
+    async def _invalidate(self, list_type: str, field: str, value: Optional[str] = None) -> None:
+        """Drop cached lookups for a changed list here and on the other workers."""
+        self._drop_cached(list_type, field, value)
+        try:
+            await self.redis.publish(
+                INVALIDATION_CHANNEL,
+                json.dumps({'list_type': list_type, 'field': field, 'value': value})
+            )
+        except Exception as e:
+            logger.warning(f"Error publishing list cache invalidation: {e}")
+    
+    async def listen_for_invalidations(self) -> None:
+        """
+        Apply list cache invalidations published by other workers.
+        
+        Meant to run as a background task for the lifetime of the service.
+        The whole cache is dropped after a connection error since messages
+        may have been missed.
+        """
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+                    try:
+                        payload = json.loads(message['data'])
+                        self._drop_cached(payload['list_type'], payload['field'], payload.get('value'))
+                    except (ValueError, KeyError, TypeError) as e:
+                        logger.warning(f"Ignoring malformed list invalidation: {e}")
+            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"List invalidation listener error: {e}")
+                self._generation += 1
+                self._cache.clear()
+                await asyncio.sleep(1)
+            
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+    
+    async def health_check(self) -> bool:
+        """Check if Redis connection is healthy."""
+        try:
+            await self.redis.ping()
+            return True
+        except Exception as e:
+            logger.error(f"Redis health check failed: {e}")
+            return False
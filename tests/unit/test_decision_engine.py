@@ -4,10 +4,26 @@ Unit tests for decision-engine service.
 Tests decision logic, idempotency, and orchestration.
 """
 
+import asyncio
+import sys
+from pathlib import Path
+
 import pytest
 from unittest.mock import AsyncMock, patch
 from datetime import datetime, timedelta
 
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "services" / "decision-engine"))
+
+import fakeredis.aioredis  # noqa: E402
+import httpx  # noqa: E402
+
+from app.circuit_breaker import CircuitBreaker  # noqa: E402
+from app.models import DecisionType, ScoreRequest  # noqa: E402
+from app.orchestrator import DecisionOrchestrator  # noqa: E402
+from app.storage import PostgresStorage, _InsertBatcher  # noqa: E402
+from app.velocity import _WINDOW_SUM_LUA, VelocityTracker  # noqa: E402
+
 
 class TestDecisionLogic:
     """Tests for fraud decision making logic."""
@@ -262,3 +278,366 @@ class Test2FARequirement:
             return True
 
         return False
+
+
+class TestOrchestrationTimeout:
+    """Tests for the TOTAL_TIMEOUT_MS cap on upstream calls."""
+
+    @pytest.mark.unit
+    async def test_slow_model_keeps_critical_rule_hit(self):
+        """A critical rule hit still denies when only the model misses the budget."""
+        orchestrator = DecisionOrchestrator()
+        orchestrator._total_timeout = 0.05
+
+        async def slow_model(request):
+            await asyncio.sleep(1)
+            return 0.1, []
+
+        request = ScoreRequest(
+            event_id="evt_timeout_001",
+            amount=150.0,
+            merchant={"id": "merch_789", "mcc": "5411", "country": "FR"},
+            card={"card_id": "card_123456", "user_id": "user_123", "type": "physical"},
+            context={"channel": "pos"}
+        )
+        velocity = {"velocity_1h": 1, "velocity_24h": 1, "amount_sum_24h": 150.0}
+
+        with patch.object(orchestrator, "call_model_serving", slow_model), \
+                patch.object(orchestrator, "call_rules_service",
+                             AsyncMock(return_value=(["deny_list_card"], True))), \
+                patch("app.orchestrator.velocity_tracker.record_transaction",
+                      AsyncMock(return_value=velocity)):
+            result = await orchestrator.orchestrate(request)
+
+        assert result["decision"] == DecisionType.DENY
+        assert result["rule_hits"] == ["deny_list_card"]
+        assert result["score"] is None
+
+
+class TestModelServingCall:
+    """Tests for the coalesced and cached Model Serving call."""
+
+    @staticmethod
+    def _request(event_id):
+        return ScoreRequest(
+            event_id=event_id,
+            amount=150.0,
+            merchant={"id": "merch_789", "mcc": "5411", "country": "FR"},
+            card={"card_id": "card_123456", "user_id": "user_123", "type": "physical"},
+            context={"channel": "pos"}
+        )
+
+    @staticmethod
+    def _orchestrator(*responses):
+        """Orchestrator whose model POSTs return the given (status, body) pairs in turn."""
+        orchestrator = DecisionOrchestrator()
+        replies = iter(responses)
+
+        async def post(url, **kwargs):
+            await asyncio.sleep(0.01)
+            status, body = next(replies)
+            return httpx.Response(status, json=body, request=httpx.Request("POST", url))
+
+        orchestrator.model_client = AsyncMock()
+        orchestrator.model_client.post.side_effect = post
+        return orchestrator
+
+    @pytest.mark.unit
+    async def test_concurrent_identical_requests_share_one_post(self):
+        """Concurrent calls with the same scoring inputs issue a single POST."""
+        orchestrator = self._orchestrator((200, {"score": 0.42, "top_features": ["amt"]}))
+        results = await asyncio.gather(*[
+            orchestrator.call_model_serving(self._request(f"evt_{i}")) for i in range(5)
+        ])
+        assert results == [(0.42, ["amt"])] * 5
+        assert orchestrator.model_client.post.await_count == 1
+
+    @pytest.mark.unit
+    async def test_cached_score_reused_for_other_event_id(self):
+        """event_id is not part of the cache key: a later event reuses the score."""
+        orchestrator = self._orchestrator((200, {"score": 0.42, "top_features": []}))
+        assert await orchestrator.call_model_serving(self._request("evt_1")) == (0.42, [])
+        assert await orchestrator.call_model_serving(self._request("evt_2")) == (0.42, [])
+        assert orchestrator.model_client.post.await_count == 1
+
+    @pytest.mark.unit
+    async def test_failures_are_not_cached(self):
+        """Error responses and missing scores are retried, never served from cache."""
+        orchestrator = self._orchestrator(
+            (503, {"error": "Model not loaded"}),
+            (200, {"top_features": []}),
+            (200, {"score": 0.1, "top_features": []})
+        )
+        assert await orchestrator.call_model_serving(self._request("evt_1")) == (None, [])
+        assert await orchestrator.call_model_serving(self._request("evt_2")) == (None, [])
+        assert await orchestrator.call_model_serving(self._request("evt_3")) == (0.1, [])
+        assert orchestrator.model_client.post.await_count == 3
+
+
+class TestCircuitBreaker:
+    """Tests for the Model Serving circuit breaker."""
+
+    @pytest.fixture
+    def clock(self):
+        now = [1000.0]
+        with patch("app.circuit_breaker.time.monotonic", side_effect=lambda: now[0]):
+            yield now
+
+    @pytest.mark.unit
+    def test_opens_after_fail_max(self, clock):
+        """The circuit opens on the fail_max-th consecutive failure."""
+        breaker = CircuitBreaker("test", fail_max=3, reset_timeout=5.0)
+        for _ in range(2):
+            breaker.record_failure()
+            assert breaker.allow() is True
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+
+    @pytest.mark.unit
+    def test_half_open_lets_one_trial_through(self, clock):
+        """After the cooldown only a single trial call is allowed."""
+        breaker = CircuitBreaker("test", fail_max=1, reset_timeout=5.0)
+        breaker.record_failure()
+        clock[0] += 5.0
+        assert breaker.allow() is True
+        assert breaker.state == "half-open"
+        assert [breaker.allow() for _ in range(3)] == [False, False, False]
+
+    @pytest.mark.unit
+    def test_successful_trial_closes(self, clock):
+        """A successful trial closes the circuit."""
+        breaker = CircuitBreaker("test", fail_max=1, reset_timeout=5.0)
+        breaker.record_failure()
+        clock[0] += 5.0
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert [breaker.allow() for _ in range(3)] == [True, True, True]
+
+    @pytest.mark.unit
+    def test_failed_trial_reopens(self, clock):
+        """A failed trial reopens the circuit for a new cooldown."""
+        breaker = CircuitBreaker("test", fail_max=3, reset_timeout=5.0)
+        for _ in range(3):
+            breaker.record_failure()
+        clock[0] += 5.0
+        assert breaker.allow() is True
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+        clock[0] += 5.0
+        assert breaker.allow() is True
+
+    @pytest.mark.unit
+    async def test_trial_ending_in_decoding_error_is_settled(self, clock):
+        """A trial call failing with a non-transport error still ends the trial."""
+        orchestrator = DecisionOrchestrator()
+        orchestrator.model_client = AsyncMock()
+        orchestrator.model_client.post.side_effect = httpx.ConnectError("refused")
+        breaker = orchestrator._model_breaker
+        for _ in range(breaker.fail_max):
+            assert await orchestrator._post_model_serving({}) == (None, [])
+        assert breaker.state == "open"
+
+        clock[0] += breaker.reset_timeout
+        assert breaker.allow() is True
+        orchestrator.model_client.post.side_effect = httpx.DecodingError("bad gzip")
+        assert await orchestrator._post_model_serving({}) == (None, [])
+        assert breaker.state == "open"
+
+        clock[0] += breaker.reset_timeout
+        assert breaker.allow() is True
+
+
+class _FakeConnection:
+    """Records executemany/COPY batches; rows containing "bad" fail the batch."""
+
+    def __init__(self, batches):
+        self.batches = batches
+
+    async def executemany(self, sql, rows):
+        self._record(rows)
+
+    async def copy_records_to_table(self, table, records, columns):
+        self._record(records)
+
+    def _record(self, rows):
+        if any("bad" in row for row in rows):
+            raise ValueError("constraint violation")
+        self.batches.append(list(rows))
+
+
+class _FakePool:
+    def __init__(self):
+        self.batches = []
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return _FakeConnection(self.batches)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestInsertBatcher:
+    """Tests for the batched executemany/COPY writer."""
+
+    @pytest.mark.unit
+    async def test_concurrent_submits_share_one_write(self):
+        """Rows submitted together go out in a single round trip."""
+        pool = _FakePool()
+        batcher = _InsertBatcher("events", max_batch=256, sql="INSERT ...")
+        batcher.start(pool)
+        await asyncio.gather(*[batcher.submit(i, "row") for i in range(10)])
+        await batcher.stop()
+        assert pool.batches == [[(i, "row") for i in range(10)]]
+
+    @pytest.mark.unit
+    async def test_copy_path_used_for_columns(self):
+        """Batchers configured with columns write through COPY."""
+        pool = _FakePool()
+        batcher = _InsertBatcher("dpia_logs", max_batch=256, columns=("event", "details"))
+        batcher.start(pool)
+        with patch.object(_FakeConnection, "executemany", side_effect=AssertionError):
+            await asyncio.gather(*[batcher.submit("SCA_TRIGGERED", {"n": i}) for i in range(3)])
+        await batcher.stop()
+        assert len(pool.batches) == 1 and len(pool.batches[0]) == 3
+
+    @pytest.mark.unit
+    async def test_bad_row_fails_only_its_caller(self):
+        """A failed batch is retried row by row; only the bad row raises."""
+        pool = _FakePool()
+        batcher = _InsertBatcher("events", max_batch=256, sql="INSERT ...")
+        batcher.start(pool)
+        results = await asyncio.gather(
+            batcher.submit(1, "ok"), batcher.submit(2, "bad"), batcher.submit(3, "ok"),
+            return_exceptions=True
+        )
+        await batcher.stop()
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], ValueError)
+        assert pool.batches == [[(1, "ok")], [(3, "ok")]]
+
+    @pytest.mark.unit
+    async def test_stop_flushes_queued_rows_and_rejects_later_submits(self):
+        """stop() writes what is queued; submits after it fail fast."""
+        pool = _FakePool()
+        batcher = _InsertBatcher("events", max_batch=2, sql="INSERT ...")
+        batcher.start(pool)
+        pending = [asyncio.ensure_future(batcher.submit(i)) for i in range(5)]
+        await asyncio.sleep(0)
+        await batcher.stop()
+        await asyncio.gather(*pending)
+        assert [row for batch in pool.batches for row in batch] == [(i,) for i in range(5)]
+        assert all(len(batch) <= 2 for batch in pool.batches)
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(batcher.submit(99), timeout=1.0)
+
+
+
+class TestAuditLogStorage:
+    """Tests for signed audit log writes."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("details", [
+        {1: "card", 2: "amount"},
+        {"payload": "x" * 4096},
+    ])
+    async def test_audit_row_written_for_any_signable_details(self, details):
+        """Details the signer accepts are stored, small or offloaded."""
+        storage = PostgresStorage()
+        storage.pool = object()
+        with patch.object(storage._audit_writer, "submit", AsyncMock()) as submit:
+            stored = await storage.store_audit_log(
+                actor="decision-engine",
+                action="SCORE_TRANSACTION",
+                entity="transaction",
+                entity_id="txn_123",
+                details=details
+            )
+        assert stored is True
+        submit.assert_awaited_once()
+
+@pytest.fixture
+async def velocity_tracker_fake():
+    """VelocityTracker wired to an in-memory Redis (Lua scripting included)."""
+    tracker = VelocityTracker()
+    tracker.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    tracker._window_sum = tracker.redis_client.register_script(_WINDOW_SUM_LUA)
+    tracker.connected = True
+    yield tracker
+    await tracker.redis_client.aclose()
+
+
+class TestVelocityWindows:
+    """Tests for the bucketed 1h/24h velocity windows."""
+
+    # Hour-aligned epoch second: minute and hour buckets start here
+    BASE = 472_222 * 3600
+
+    async def _record_at(self, tracker, ts, amount):
+        with patch("app.velocity.time.time", return_value=ts):
+            return await tracker.record_transaction("user_123", amount)
+
+    @pytest.mark.unit
+    async def test_windows_across_bucket_edges(self, velocity_tracker_fake):
+        """Counts follow minute buckets for 1h and hour buckets for 24h."""
+        tracker, base = velocity_tracker_fake, self.BASE
+
+        assert await self._record_at(tracker, base, 10.25) == {
+            "velocity_1h": 1, "velocity_24h": 1, "amount_sum_24h": 10.25
+        }
+        # Last second of the first hour: both windows still hold the first one
+        assert await self._record_at(tracker, base + 3599, 5.5) == {
+            "velocity_1h": 2, "velocity_24h": 2, "amount_sum_24h": 15.75
+        }
+        # 61st minute: the first minute bucket has left the 1h window
+        assert await self._record_at(tracker, base + 3659, 1.0) == {
+            "velocity_1h": 2, "velocity_24h": 3, "amount_sum_24h": 16.75
+        }
+        # Last second of the 24th hour: everything is inside the 24h window
+        assert await self._record_at(tracker, base + 23 * 3600 + 3599, 1.0) == {
+            "velocity_1h": 1, "velocity_24h": 4, "amount_sum_24h": 17.75
+        }
+        # Next hour: the whole first hour bucket drops out at once, including
+        # the transaction recorded only 23h00m01s earlier
+        assert await self._record_at(tracker, base + 24 * 3600, 1.0) == {
+            "velocity_1h": 2, "velocity_24h": 3, "amount_sum_24h": 3.0
+        }
+
+    @pytest.mark.unit
+    async def test_window_sum_script_returns_float_as_string(self, velocity_tracker_fake):
+        """The Lua sum keeps decimals (Lua numbers are truncated in replies)."""
+        tracker = velocity_tracker_fake
+        await tracker.redis_client.set("velocity:user_123:amount_1h:1", "12.5")
+        await tracker.redis_client.set("velocity:user_123:amount_1h:2", "0.25")
+        await tracker.redis_client.set("velocity:user_123:count_1m:7", "3")
+        keys = ["velocity:user_123:count_1m:7", "velocity:user_123:count_1h:2",
+                "velocity:user_123:amount_1h:1", "velocity:user_123:amount_1h:2"]
+
+        sums = await tracker._window_sum(keys=keys, args=[1, 1])
+
+        assert sums == [3, 0, "12.75"]
+        assert tracker._to_velocity(sums) == {
+            "velocity_1h": 3, "velocity_24h": 0, "amount_sum_24h": 12.75
+        }
+
+    @pytest.mark.unit
+    async def test_script_flush_falls_back_to_eval(self, velocity_tracker_fake):
+        """After SCRIPT FLUSH the EVALSHA miss is retried without re-counting."""
+        tracker, base = velocity_tracker_fake, self.BASE
+
+        await self._record_at(tracker, base, 2.5)
+        await tracker.redis_client.script_flush()
+        assert await self._record_at(tracker, base + 1, 2.5) == {
+            "velocity_1h": 2, "velocity_24h": 2, "amount_sum_24h": 5.0
+        }
+        # The retry reloaded the script: the next call succeeds on EVALSHA
+        assert await tracker.redis_client.script_exists(tracker._window_sum.sha) == [True]
+        assert await self._record_at(tracker, base + 2, 2.5) == {
+            "velocity_1h": 3, "velocity_24h": 3, "amount_sum_24h": 7.5
+        }
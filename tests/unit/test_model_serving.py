@@ -4,10 +4,24 @@ Unit tests for model-serving service.
 Tests ML inference, feature engineering, and prediction logic.
 """
 
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
 import pytest
 import numpy as np
 from unittest.mock import MagicMock, patch
 
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "services" / "model-serving"))
+
+import lightgbm as lgb  # noqa: E402
+
+from app import geolocation  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.inference import ModelInference  # noqa: E402
+
 
 class TestFeatureEngineering:
     """Tests for feature extraction and transformation."""
@@ -209,3 +223,123 @@ class TestModelPrediction:
         elif score <= 0.70:
             return "CHALLENGE"
         return "DENY"
+
+
+class TestGeolocationBatching:
+    """Tests for batched ip-api.com lookups."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_short_batch_reply_resolves_every_lookup(self):
+        """A /batch reply missing results must not leave lookups hanging."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            # Three queries, two results
+            return httpx.Response(200, json=[
+                {"status": "success", "city": "Paris", "country": "France", "lat": 48.8, "lon": 2.3},
+                {"status": "success", "city": "Lyon", "country": "France", "lat": 45.7, "lon": 4.8},
+            ])
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        ips = ["8.8.8.8", "1.1.1.1", "9.9.9.9"]
+        with patch.object(geolocation, "get_http_client", return_value=client):
+            results = await asyncio.wait_for(
+                asyncio.gather(*[geolocation._lookup_ip_api(ip, 1.0) for ip in ips]),
+                timeout=2.0
+            )
+        await client.aclose()
+
+        assert [geo.ip for geo in results] == ips
+        assert all(not geo.success for geo in results)
+        assert not geolocation._batch_pending
+        assert geolocation._batch_flush_task is None
+
+
+@pytest.fixture
+async def tiny_model(tmp_path):
+    """ModelInference over a small booster trained on random data."""
+    rng = np.random.default_rng(0)
+    n_features = len(settings.expected_features)
+    X = rng.random((200, n_features))
+    y = (X[:, 0] + 0.3 * rng.random(200) > 0.8).astype(int)
+    booster = lgb.train(
+        {"objective": "binary", "num_leaves": 7, "min_data_in_leaf": 5, "verbose": -1},
+        lgb.Dataset(X, label=y),
+        num_boost_round=10
+    )
+    model_path = tmp_path / "model.bin"
+    booster.save_model(str(model_path))
+
+    inference = ModelInference(str(model_path))
+    inference.load_model()
+    yield inference, booster
+    await inference.close()
+
+
+class TestModelInference:
+    """Tests for the inference paths: single row, packed bytes, micro-batches."""
+
+    @staticmethod
+    def _rows(n):
+        rng = np.random.default_rng(42)
+        return rng.random((n, len(settings.expected_features))).astype(np.float32)
+
+    @pytest.mark.unit
+    @pytest.mark.model
+    @pytest.mark.parametrize("n_rows", [5, 20])  # inline and thread-offloaded batches
+    async def test_all_paths_match_booster_predict(self, tiny_model, n_rows):
+        """Batched, single-row and packed-bytes scores equal Booster.predict exactly."""
+        inference, booster = tiny_model
+        rows = self._rows(n_rows)
+        expected = booster.predict(rows)
+
+        batched = await asyncio.gather(*[inference.predict_async(row.tolist()) for row in rows])
+        inference._cache.clear()
+        single = [inference.predict(row.tolist()) for row in rows]
+        packed = [inference.predict_bytes(row.astype("<f4").tobytes()) for row in rows]
+
+        np.testing.assert_array_equal(batched, expected)
+        np.testing.assert_array_equal(single, expected)
+        np.testing.assert_array_equal(packed, expected)
+
+    @pytest.mark.unit
+    @pytest.mark.model
+    async def test_failed_batch_settles_every_caller(self, tiny_model):
+        """When a model call raises, every caller in the batch gets the error."""
+        inference, _ = tiny_model
+        rows = self._rows(8)
+        with patch.object(inference, "_score", side_effect=ValueError("boom")):
+            results = await asyncio.wait_for(
+                asyncio.gather(*[inference.predict_async(row.tolist()) for row in rows],
+                               return_exceptions=True),
+                timeout=2.0
+            )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        # The batch loop survives the failure
+        assert 0.0 <= await inference.predict_async(rows[0].tolist()) <= 1.0
+
+    @pytest.mark.unit
+    @pytest.mark.model
+    async def test_repeat_prediction_served_from_cache(self, tiny_model):
+        """A repeated feature vector is answered from the LRU without a model call."""
+        inference, _ = tiny_model
+        features = self._rows(1)[0].tolist()
+        score = await inference.predict_async(features)
+        with patch.object(inference, "_score", side_effect=AssertionError("model called")):
+            assert await inference.predict_async(features) == score
+            assert inference.predict(features) == score
+
+    @pytest.mark.unit
+    def test_batch_limit_halves_on_sla_miss_and_recovers(self):
+        """The adaptive batch cap is AIMD against max_prediction_time_ms."""
+        inference = ModelInference("unused.bin")
+        sla = settings.max_prediction_time_ms / 1000
+        inference._tune_batch_limit(sla * 2)
+        assert inference._batch_limit == settings.predict_max_batch // 2
+        inference._tune_batch_limit(sla / 2)
+        assert inference._batch_limit == settings.predict_max_batch // 2 + 1
+        for _ in range(10):
+            inference._tune_batch_limit(sla * 2)
+        assert inference._batch_limit == 1
+        for _ in range(settings.predict_max_batch * 2):
+            inference._tune_batch_limit(0.0)
+        assert inference._batch_limit == settings.predict_max_batch
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from pathlib import Path
 import sys
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -124,14 +124,23 @@ class TestRulesEngine:
         assert matched[0]["metadata"]["severity"] == "high"
 
 
+def _redis_with_pipeline(results):
+    """Redis mock whose (non-transactional) pipeline returns the given results."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results)
+    redis_client = AsyncMock()
+    redis_client.pipeline = MagicMock(return_value=pipe)
+    return redis_client, pipe
+
+
 class TestListsChecker:
-    # Scenarios covered: deny match, allow match, add/remove list entry, decode list members.
+    # Scenarios covered: deny match, allow match, deny+allow in one round trip,
+    # cached lookups and invalidation, add/remove list entry, decode list members.
 
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_check_deny_lists_match(self):
-        redis_client = AsyncMock()
-        redis_client.sismember.side_effect = [True]
+        redis_client, pipe = _redis_with_pipeline([True])
         checker = ListsChecker(redis_client)
         context = {"user_id": "user_123"}
         matches = await checker.check_deny_lists(context)
@@ -142,14 +151,42 @@ class TestListsChecker:
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_check_allow_lists_match(self):
-        redis_client = AsyncMock()
-        redis_client.sismember.side_effect = [True]
+        redis_client, pipe = _redis_with_pipeline([True])
         checker = ListsChecker(redis_client)
         context = {"user_id": "user_123"}
         matches = await checker.check_allow_lists(context)
         assert len(matches) == 1
         assert matches[0]["list_type"] == "allow"
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_all_lists_single_round_trip(self):
+        redis_client, pipe = _redis_with_pipeline([False, True, True, False])
+        checker = ListsChecker(redis_client)
+        context = {"user_id": "user_123", "ip_address": "1.2.3.4"}
+        deny_matches, allow_matches = await checker.check_all_lists(context)
+        pipe.execute.assert_awaited_once()
+        assert pipe.sismember.call_args_list[0].args == ("deny_list:user_id", "user_123")
+        assert [m["field"] for m in deny_matches] == ["ip_address"]
+        assert [m["field"] for m in allow_matches] == ["user_id"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cached_lookup_skips_redis_until_invalidated(self):
+        redis_client, pipe = _redis_with_pipeline([False])
+        checker = ListsChecker(redis_client)
+        context = {"user_id": "user_123"}
+        assert await checker.check_deny_lists(context) == []
+        assert await checker.check_deny_lists(context) == []
+        pipe.execute.assert_awaited_once()
+
+        pipe.execute.return_value = [True]
+        await checker.add_to_deny_list("user_id", "user_123")
+        redis_client.publish.assert_awaited_once()
+        matches = await checker.check_deny_lists(context)
+        assert [m["matched_value"] for m in matches] == ["user_123"]
+        assert pipe.execute.await_count == 2
+
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_add_to_deny_list_with_ttl(self):